@@ -0,0 +1,139 @@
+"""
+Password Strength Checker - Analysis Cache
+A bounded, process-wide cache of analysis results so repeated passwords
+(rerun pages, audit jobs re-checking the same strings) skip the analysis.
+
+Entries are keyed by an HMAC-SHA256 of the password under a secret that is
+generated per process and never leaves it, so the cache holds no passwords
+and its keys can't be matched against a precomputed dictionary. Entries are
+evicted least-recently-used beyond max_entries and expire after ttl seconds.
+The whole cache is dropped when the wordlist is reloaded or a rule is
+registered or removed, since results depend on both.
+
+Set ANALYSIS_CACHE_SIZE (0 disables caching) and ANALYSIS_CACHE_TTL to tune it.
+"""
+
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import analyzer
+import wordlist
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_SIZE", "10000"))
+DEFAULT_TTL = float(os.environ.get("ANALYSIS_CACHE_TTL", "600"))
+
+def _dependencies():
+    """The wordlist structures and rule registry version analysis results were computed against"""
+    return (wordlist.get_available_passwords(), wordlist.get_available_substring_matcher(),
+            wordlist.get_available_leet_index(), analyzer.RULES.version)
+
+class AnalysisCache:
+    """LRU cache with expiry, keyed by a per-process secret HMAC of the password"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._secret = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        # key -> (expiry time, result), least recently used first
+        self._entries = OrderedDict()
+        self._dependencies = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, password):
+        return hmac.digest(self._secret, password.encode("utf-8", "surrogatepass"), "sha256")
+
+    def _check_dependencies(self, current):
+        # Called with the lock held; a reloaded wordlist or changed rule makes every entry stale
+        if self._dependencies is None or any(a is not b and a != b for a, b in zip(current, self._dependencies)):
+            self._entries.clear()
+            self._dependencies = current
+
+    def get(self, password):
+        """Return the cached result for a password, or None"""
+        if self.max_entries <= 0:
+            return None
+        key = self._key(password)
+        current = _dependencies()
+        with self._lock:
+            self._check_dependencies(current)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, result = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, password, result):
+        """Cache a result for a password, evicting the least recently used entries if full"""
+        if self.max_entries <= 0:
+            return
+        key = self._key(password)
+        current = _dependencies()
+        with self._lock:
+            self._check_dependencies(current)
+            self._entries[key] = (self._clock() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, password, compute):
+        """Return the cached result for a password, computing and caching it on a miss"""
+        result = self.get(password)
+        if result is None:
+            result = compute(password)
+            self.put(password, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return the cache counters as a dict"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+# Shared by every session and audit job in the process
+_cache = AnalysisCache()
+
+def get_analysis_cache():
+    """Return the process-wide analysis cache"""
+    return _cache
+
+def cached_analysis(password, analyze=analyzer.analyze_password_strength):
+    """Return the AnalysisResult for a password, from the shared cache when possible
+
+    analyze computes results on a miss; it must give the same results as
+    analyze_password_strength (e.g. an IncrementalAnalyzer's analyze method).
+    Results are never modified, so hits can share them.
+    """
+    return _cache.get_or_compute(password, analyze)
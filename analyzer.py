@@ -0,0 +1,561 @@
+"""
+Password Strength Checker - Password Analysis
+Scoring, entropy, pattern checks and suggestions, kept free of Streamlit so
+they can be imported by batch audits as well as the web app.
+"""
+
+import math
+import re
+import string
+import unicodedata
+from collections import Counter
+
+import breach_corpus
+import date_patterns
+from byte_steps import byte_steps
+import keyboard_graphs
+import rule_pipeline
+import wordlist
+
+# --- Character classification ---
+# One translate() pass maps every character to a class code, replacing
+# separate regex scans per class. ASCII characters are in a plain table;
+# any other character is classified from its Unicode category, so letters,
+# digits and symbols of every script count.
+LOWER, UPPER, DIGIT = "l", "u", "d"
+SYMBOL = "y"      # ASCII punctuation, in both the scoring and the entropy symbol sets
+INTL_LOWER = "a"  # Lower-case letters outside ASCII ("é", "д")
+INTL_UPPER = "b"  # Upper- and title-case letters outside ASCII ("É", "Д")
+UNCASED = "c"     # Letters of scripts without case ("中", "ا"), counted as lower case
+INTL_DIGIT = "n"  # Digits and other numbers outside ASCII ("٣", "²")
+SPECIAL = "s"     # Symbols and punctuation outside ASCII, including emoji
+OTHER = "o"       # Spaces, controls and combining marks
+SYMBOLS = string.punctuation
+
+# Characters an attacker's alphabet gains for each class present. Scripts are
+# not told apart, so the non-ASCII sizes are typical rather than exact.
+CHARSET_SIZES = {LOWER: 26, UPPER: 26, DIGIT: 10, SYMBOL: 32, INTL_LOWER: 32, INTL_UPPER: 32,
+                 UNCASED: 256, INTL_DIGIT: 10, SPECIAL: 64}
+
+_CATEGORY_CLASSES = {"Ll": INTL_LOWER, "Lu": INTL_UPPER, "Lt": INTL_UPPER, "Lo": UNCASED,
+                     "Lm": UNCASED, "Nd": INTL_DIGIT, "Nl": INTL_DIGIT, "No": INTL_DIGIT}
+for _category in ("Pc", "Pd", "Ps", "Pe", "Pi", "Pf", "Po", "Sm", "Sc", "Sk", "So"):
+    _CATEGORY_CLASSES[_category] = SPECIAL
+
+# Unicode classes are kept as a two-level table: 256-code-point blocks of
+# class bytes, filled in on first use and shared between identical blocks
+# (most blocks are all letters or all unassigned), indexed by code >> 8
+_BLOCK_COUNT = 0x110000 >> 8
+_blocks = [None] * _BLOCK_COUNT
+_distinct_blocks = {}
+
+def unicode_block(index):
+    """Return the 256 class bytes for code points index * 256 to index * 256 + 255"""
+    block = _blocks[index]
+    if block is None:
+        base = index << 8
+        category = unicodedata.category
+        block = bytes(ord(_CATEGORY_CLASSES.get(category(chr(base | low)), OTHER)) for low in range(256))
+        if index == 0:
+            block = bytes(ord(_ASCII_CLASS_TABLE[code]) for code in range(128)) + block[128:]
+        block = _distinct_blocks.setdefault(block, block)
+        _blocks[index] = block
+    return block
+
+class _ClassTable:
+    """Code point -> class code for str.translate, read straight from the block tables"""
+
+    def __getitem__(self, code):
+        return chr(unicode_block(code >> 8)[code & 0xFF])
+
+# A plain dict translates faster, so ASCII passwords skip the lookup hook
+_ASCII_CLASS_TABLE = {code: OTHER for code in range(128)}
+_ASCII_CLASS_TABLE.update({ord(ch): LOWER for ch in string.ascii_lowercase})
+_ASCII_CLASS_TABLE.update({ord(ch): UPPER for ch in string.ascii_uppercase})
+_ASCII_CLASS_TABLE.update({ord(ch): DIGIT for ch in string.digits})
+_ASCII_CLASS_TABLE.update({ord(ch): SYMBOL for ch in SYMBOLS})
+CLASS_TABLE = _ClassTable()
+
+def char_class(ch):
+    """Return the class code of a single character"""
+    return CLASS_TABLE[ord(ch)]
+
+# --- Issue codes ---
+# Each issue is one bit of an integer mask; bit order is the order issues are reported
+TOO_SHORT = 1 << 0
+NO_LOWER = 1 << 1
+NO_UPPER = 1 << 2
+NO_DIGIT = 1 << 3
+NO_SPECIAL = 1 << 4
+COMMON_PASSWORD = 1 << 5
+LEET_PASSWORD = 1 << 6
+EMBEDDED_PASSWORD = 1 << 7
+BREACHED = 1 << 8
+REPEATING = 1 << 9
+SEQUENCE = 1 << 10
+KEYBOARD = 1 << 11
+DATE = 1 << 12
+PATTERN_ISSUES = REPEATING | SEQUENCE | KEYBOARD | DATE
+
+ISSUE_MESSAGES = {
+    TOO_SHORT: "Password too short (minimum 8 characters)",
+    NO_LOWER: "Add lowercase letters",
+    NO_UPPER: "Add uppercase letters",
+    NO_DIGIT: "Add numbers",
+    NO_SPECIAL: "Add special characters (!@#$%^&*)",
+    COMMON_PASSWORD: "Avoid common passwords",
+    LEET_PASSWORD: "Avoid common passwords with look-alike substitutions",
+    EMBEDDED_PASSWORD: "Contains common passwords",
+    BREACHED: "Found in known data breaches",
+    REPEATING: "Contains 3+ consecutive repeating characters",
+    SEQUENCE: "Contains simple sequences (123, abc, etc.)",
+    KEYBOARD: "Contains keyboard patterns",
+    DATE: "Contains dates or years",
+}
+ISSUE_CODES = {message: code for code, message in ISSUE_MESSAGES.items()}
+
+# Suggestions in the order they are shown, with the issue each one answers
+SUGGESTION_MESSAGES = [
+    (TOO_SHORT, "• Use at least 8 characters (12+ recommended)"),
+    (NO_LOWER, "• Include lowercase letters (a-z)"),
+    (NO_UPPER, "• Include uppercase letters (A-Z)"),
+    (NO_DIGIT, "• Include numbers (0-9)"),
+    (NO_SPECIAL, "• Include special characters (!@#$%^&*)"),
+    (COMMON_PASSWORD, "• Avoid commonly used passwords"),
+    (LEET_PASSWORD, "• Swapping letters for symbols (P@ssw0rd) doesn't hide a common password"),
+    (BREACHED, "• This exact password has leaked in data breaches - never use it"),
+    (EMBEDDED_PASSWORD, "• Don't build on common passwords (e.g. 'monkey' + year)"),
+    (REPEATING, "• Avoid repeating characters"),
+    (SEQUENCE, "• Avoid simple sequences (123, abc)"),
+    (KEYBOARD, "• Avoid keyboard patterns (qwerty)"),
+    (DATE, "• Avoid dates and years (birthdays, anniversaries)"),
+]
+NO_ISSUE_SUGGESTIONS = ("• Your password looks good! Consider making it even longer for extra security.",)
+
+# Issue lists and suggestions for every possible mask, built once
+ISSUE_TABLE = [tuple(message for code, message in ISSUE_MESSAGES.items() if mask & code)
+               for mask in range(1 << len(ISSUE_MESSAGES))]
+SUGGESTION_TABLE = [tuple(message for code, message in SUGGESTION_MESSAGES if mask & code)
+                    or NO_ISSUE_SUGGESTIONS
+                    for mask in range(1 << len(ISSUE_MESSAGES))]
+
+def issue_mask(issues):
+    """Convert a list of issue messages to an issue mask"""
+    mask = 0
+    for issue in issues:
+        mask |= ISSUE_CODES.get(issue, 0)
+    return mask
+
+class AnalysisResult:
+    """Score, label, color and issue mask of one analysis
+
+    Unpacks like the (score, label, issues, color) tuple it replaces; the
+    issue messages and suggestions are shared precomputed tuples.
+    """
+    __slots__ = ("score", "label", "color", "issue_mask")
+
+    def __init__(self, score, label, color, issue_mask):
+        self.score = score
+        self.label = label
+        self.color = color
+        self.issue_mask = issue_mask
+
+    @property
+    def issues(self):
+        return list(ISSUE_TABLE[self.issue_mask])
+
+    @property
+    def suggestions(self):
+        return list(SUGGESTION_TABLE[self.issue_mask])
+
+    def has(self, code):
+        return bool(self.issue_mask & code)
+
+    def __iter__(self):
+        return iter((self.score, self.label, self.issues, self.color))
+
+    def __eq__(self, other):
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        return (self.score, self.label, self.color, self.issue_mask) == \
+            (other.score, other.label, other.color, other.issue_mask)
+
+    def __repr__(self):
+        return f"AnalysisResult(score={self.score}, label={self.label!r}, issues={self.issues})"
+
+EMPTY_RESULT = AnalysisResult(0, "No password entered", "", 0)
+
+class PasswordProfile:
+    """Character classes, counts and lower-cased form of a password, computed once"""
+    __slots__ = ("lowered", "classes", "lower_count", "upper_count", "digit_count",
+                 "symbol_count", "special_count")
+
+    def __init__(self, password):
+        is_ascii = password.isascii()
+        self.classes = classes = password.translate(_ASCII_CLASS_TABLE if is_ascii else CLASS_TABLE)
+        self.lowered = password.lower()
+        self.lower_count = classes.count(LOWER)
+        self.upper_count = classes.count(UPPER)
+        self.digit_count = classes.count(DIGIT)
+        self.symbol_count = classes.count(SYMBOL)
+        self.special_count = self.symbol_count
+        if not is_ascii:
+            # Other scripts count towards the same classes
+            self.lower_count += classes.count(INTL_LOWER) + classes.count(UNCASED)
+            self.upper_count += classes.count(INTL_UPPER)
+            self.digit_count += classes.count(INTL_DIGIT)
+            self.special_count += classes.count(SPECIAL)
+
+    @property
+    def charset_size(self):
+        """Size of the alphabet spanned by the classes present"""
+        classes = self.classes
+        return sum(size for cls, size in CHARSET_SIZES.items() if cls in classes)
+
+    @classmethod
+    def from_counts(cls, lowered, lower_count, upper_count, digit_count, symbol_count, special_count):
+        """Build a profile from counts kept elsewhere (e.g. by incremental analysis)
+
+        Its classes are unknown (None), so calculate_entropy recomputes them.
+        """
+        profile = cls.__new__(cls)
+        profile.lowered = lowered
+        profile.lower_count = lower_count
+        profile.upper_count = upper_count
+        profile.digit_count = digit_count
+        profile.symbol_count = symbol_count
+        profile.special_count = special_count
+        profile.classes = None
+        return profile
+
+    @property
+    def has_lower(self):
+        return self.lower_count > 0
+
+    @property
+    def has_upper(self):
+        return self.upper_count > 0
+
+    @property
+    def has_digit(self):
+        return self.digit_count > 0
+
+    @property
+    def has_special(self):
+        return self.special_count > 0
+
+def calculate_entropy(password, profile=None):
+    """Calculate password entropy"""
+    if not password:
+        return 0
+    if profile is None or profile.classes is None:
+        profile = PasswordProfile(password)
+    
+    charset_size = profile.charset_size
+    entropy = len(password) * math.log2(charset_size) if charset_size > 0 else 0
+    return round(entropy, 2)
+
+def shannon_entropy(password):
+    """Total Shannon entropy in bits of the password's own character frequencies"""
+    if not password:
+        return 0
+    length = len(password)
+    bits = sum(count * math.log2(length / count) for count in Counter(password).values())
+    return round(bits, 2)
+
+# Three of the same character in a row
+REPEAT_RUN = re.compile(r'(.)\1\1', re.DOTALL)
+
+def pattern_issue_mask(password, lowered=None):
+    """Return the REPEATING, SEQUENCE, KEYBOARD and DATE bits for a password"""
+    if lowered is None:
+        lowered = password.lower()
+    
+    # Check for consecutive repeating characters
+    mask = REPEATING if REPEAT_RUN.search(password) else 0
+    return mask | sequence_issue_mask(lowered) | date_issue_mask(password)
+
+def check_repeating_patterns(password, lowered=None):
+    """Check for repeating characters and simple patterns"""
+    return list(ISSUE_TABLE[pattern_issue_mask(password, lowered)])
+
+# Runs of consecutive letters or digits; other characters never join a run
+SEQUENCE_CODES = {ch: ord(ch) for ch in string.ascii_lowercase + string.digits}
+MIN_SEQUENCE_LENGTH = 3
+
+# UTF-8 bytes of letters and digits keep their code, every other byte becomes 0
+_SEQUENCE_BYTES = bytes(code if chr(code) in SEQUENCE_CODES else 0 for code in range(256))
+
+def has_sequence(lowered):
+    """True if a lower-cased password has a run of three consecutive letters or digits
+
+    The same answer as scanning SEQUENCE_CODES with sequence_runs for a run of
+    MIN_SEQUENCE_LENGTH, but the steps between bytes are computed at once
+    (see byte_steps.py), so it costs a few C-level operations; a run is two
+    steps of +1 (0x81) or -1 (0x7f) in a row.
+    """
+    try:
+        data = lowered.encode().translate(_SEQUENCE_BYTES)
+    except UnicodeEncodeError:
+        data = lowered.encode("utf-8", "surrogatepass").translate(_SEQUENCE_BYTES)
+    steps = byte_steps(data).decode("latin-1")
+    return "\x81\x81" in steps or "\x7f\x7f" in steps
+
+def extend_sequence(run, code, max_step=1):
+    """Extend an open run (last code, step, length) by one character code, returning the new run
+
+    A run keeps going while the code steps by the same amount; a step of at
+    most max_step either way starts a new two-character run, and a code of
+    None (a character that never joins a run) ends it.
+    """
+    previous, step, length = run
+    delta = code - previous if code is not None and previous is not None else 0
+    if step and delta == step:
+        return code, step, length + 1
+    if delta and -max_step <= delta <= max_step:
+        return code, delta, 2
+    return code, 0, 1
+
+# The run before any character has been seen
+NO_SEQUENCE = (None, 0, 0)
+
+def sequence_runs(codes, max_step=1):
+    """Return (start, length, step) of every run of two or more codes with a constant step
+
+    Runs are the longest extend_sequence keeps going; a run that ends on a
+    change of step shares its last character with the next one.
+    """
+    runs = []
+    run = NO_SEQUENCE
+    for i, code in enumerate(codes):
+        _, step, length = run
+        run = extend_sequence(run, code, max_step)
+        if step and run[2] != length + 1:
+            runs.append((i - length, length, step))
+    _, step, length = run
+    if step:
+        runs.append((len(codes) - length, length, step))
+    return runs
+
+# Short zigzags between adjacent keys happen by chance in ordinary words
+# ("were"), so only straight walks or long zigzags count as a pattern
+MIN_KEYBOARD_WALK = 4
+MIN_KEYBOARD_ZIGZAG = 6
+
+def is_keyboard_pattern(length, turns):
+    """True if a keyboard walk of this length and number of turns counts as a pattern"""
+    return length >= MIN_KEYBOARD_WALK and (turns <= 1 or length >= MIN_KEYBOARD_ZIGZAG)
+
+def find_keyboard_patterns(lowered):
+    """Return (layout, start, length) of keyboard walks like "qwer", "zaq1" or "!@#$" """
+    return [(layout, start, length)
+            for layout, start, length, turns, _ in keyboard_graphs.find_walks(lowered, MIN_KEYBOARD_WALK)
+            if is_keyboard_pattern(length, turns)]
+
+def sequence_issue_mask(lowered):
+    """Return the SEQUENCE and KEYBOARD bits for a lower-cased password"""
+    mask = 0
+    
+    # Check for ascending or descending runs of letters or digits
+    if has_sequence(lowered):
+        mask |= SEQUENCE
+    
+    # Check for keyboard walks on any supported layout
+    if find_keyboard_patterns(lowered):
+        mask |= KEYBOARD
+    
+    return mask
+
+def date_issue_mask(password):
+    """Return the DATE bit if a password contains a year or a date ("1987", "0412", "12/04/87")"""
+    return DATE if date_patterns.has_date(password) else 0
+
+def common_password_penalty(rank, list_size):
+    """Scale the common password penalty by popularity (rank 1 costs 40 points, the last entry 20)"""
+    if list_size <= 1:
+        return 40
+    popularity = 1 - math.log(rank) / math.log(list_size)
+    return 20 + round(20 * max(0.0, popularity))
+
+def dictionary_issue_mask(password, lowered, embedded=None, common_passwords=None):
+    """Check a password against the common password list and breach corpus, returning (penalty, issue mask)
+
+    embedded can pass in an already known answer to "does it contain a common password",
+    and common_passwords a loaded copy of the list to look it up in.
+    """
+    penalty = 0
+    mask = 0
+    
+    # Avoid common passwords (-20 to -40 points depending on popularity)
+    # While a background load is still running this checks only its most popular entries
+    if common_passwords is None:
+        common_passwords = wordlist.get_available_passwords()
+    common_rank = common_passwords.rank(lowered)
+    if common_rank is not None:
+        penalty += common_password_penalty(common_rank, len(common_passwords))
+        mask |= COMMON_PASSWORD
+    else:
+        # Look-alike spellings of common passwords, e.g. "P@ssw0rd" (-15 to -35 points)
+        leet = wordlist.get_available_leet_index()
+        leet_rank = leet.rank(lowered) if leet is not None else None
+        if leet_rank is not None:
+            penalty += common_password_penalty(leet_rank, len(common_passwords)) - 5
+            mask |= LEET_PASSWORD
+        else:
+            # Common passwords hidden inside longer ones, e.g. "Summer2024!monkey" (-10 points)
+            if embedded is None:
+                matcher = wordlist.get_available_substring_matcher()
+                embedded = matcher is not None and bool(matcher.find_all(lowered))
+            if embedded:
+                penalty += 10
+                mask |= EMBEDDED_PASSWORD
+    
+    # Passwords seen in real breaches (-30 points), when an offline corpus is installed
+    corpus = breach_corpus.get_breach_corpus()
+    if corpus is not None and corpus.count(password):
+        penalty += 30
+        mask |= BREACHED
+    
+    return penalty, mask
+
+def get_strength_label(score):
+    """Map a 0-100 score to its strength label and color"""
+    if score >= 80:
+        return "Very Strong", "#00ff00"
+    elif score >= 60:
+        return "Strong", "#90ee90"
+    elif score >= 40:
+        return "Moderate", "#ffa500"
+    elif score >= 20:
+        return "Weak", "#ff6347"
+    else:
+        return "Very Weak", "#ff0000"
+
+class CheckContext:
+    """What the rules see of one non-empty password
+
+    pattern_mask and embedded carry pattern answers already known to the
+    caller (e.g. incremental analysis), or None to have the rules compute them.
+    """
+    __slots__ = ("password", "profile", "pattern_mask", "embedded")
+
+    def __init__(self, password, profile, pattern_mask=None, embedded=None):
+        self.password = password
+        self.profile = profile
+        self.pattern_mask = pattern_mask
+        self.embedded = embedded
+
+# Rules run cheapest first; register_rule adds checks without touching the scoring below
+RULES = rule_pipeline.RulePipeline()
+register_rule = RULES.register
+
+@RULES.rule("length", cost=1, max_points=40)
+def _length_rule(context, mask):
+    # Length check (0-25 points), plus a bonus for length > 12 (0-15 points)
+    length = len(context.password)
+    if length >= 12:
+        return 25 + min(15, (length - 12) * 2), 0
+    elif length >= 8:
+        return 15, 0
+    elif length >= 6:
+        return 10, 0
+    return 0, TOO_SHORT
+
+@RULES.rule("variety", cost=1, max_points=40)
+def _variety_rule(context, mask):
+    # Character variety (0-40 points total)
+    profile = context.profile
+    variety_mask = 0
+    if not profile.has_lower:
+        variety_mask |= NO_LOWER
+    if not profile.has_upper:
+        variety_mask |= NO_UPPER
+    if not profile.has_digit:
+        variety_mask |= NO_DIGIT
+    if not profile.has_special:
+        variety_mask |= NO_SPECIAL
+    return 40 - 10 * bin(variety_mask).count("1"), variety_mask
+
+def _pattern_result(found, mask):
+    # Patterns cost 10 points once, however many kinds are found
+    if not found:
+        return 0, 0
+    return (0 if mask & PATTERN_ISSUES else -10), found
+
+@RULES.rule("repeats", cost=2, max_points=0)
+def _repeat_rule(context, mask):
+    if context.pattern_mask is not None:
+        return _pattern_result(context.pattern_mask & REPEATING, mask)
+    return _pattern_result(REPEATING if REPEAT_RUN.search(context.password) else 0, mask)
+
+@RULES.rule("sequences", cost=4, max_points=0)
+def _sequence_rule(context, mask):
+    if context.pattern_mask is not None:
+        return _pattern_result(context.pattern_mask & SEQUENCE, mask)
+    return _pattern_result(SEQUENCE if has_sequence(context.profile.lowered) else 0, mask)
+
+@RULES.rule("keyboard", cost=8, max_points=0)
+def _keyboard_rule(context, mask):
+    if context.pattern_mask is not None:
+        return _pattern_result(context.pattern_mask & KEYBOARD, mask)
+    return _pattern_result(KEYBOARD if find_keyboard_patterns(context.profile.lowered) else 0, mask)
+
+@RULES.rule("dates", cost=3, max_points=0)
+def _date_rule(context, mask):
+    if context.pattern_mask is not None:
+        return _pattern_result(context.pattern_mask & DATE, mask)
+    return _pattern_result(date_issue_mask(context.password), mask)
+
+@RULES.rule("dictionary", cost=10, max_points=0)
+def _dictionary_rule(context, mask):
+    # Common, look-alike, embedded and breached passwords
+    penalty, dictionary_mask = dictionary_issue_mask(context.password, context.profile.lowered,
+                                                     context.embedded)
+    return -penalty, dictionary_mask
+
+# The checks batch_analysis vectorizes; once the rules differ from these it runs the pipeline per password
+BUILTIN_RULES = frozenset(RULES)
+
+def analyze_password_strength(password):
+    """Analyze password strength and return an AnalysisResult (unpacks as score, label, issues, color)"""
+    if not password:
+        return EMPTY_RESULT
+    
+    # Character classes in a single pass; the rules check length, variety, patterns and dictionaries
+    return _score(CheckContext(password, PasswordProfile(password)))
+
+def score_password(password, profile, pattern_mask, embedded=None):
+    """Score a non-empty password from its profile and already known pattern issue bits"""
+    return _score(CheckContext(password, profile, pattern_mask, embedded))
+
+# Lowest score a password-change hook accepts by default ("Strong")
+MIN_ACCEPTABLE_SCORE = 60
+
+def is_acceptable(password, min_score=MIN_ACCEPTABLE_SCORE):
+    """Fast pass/fail: True if analyze_password_strength would score the password at least min_score
+
+    Skips the label, color and suggestions, and stops at the first rule after
+    which the score can no longer reach min_score, so weak passwords are
+    rejected on the length and variety rules before any dictionary lookup.
+    """
+    if min_score <= 0:
+        return True
+    if not password:
+        return False
+    return RULES.meets(CheckContext(password, PasswordProfile(password)), min_score)
+
+def _score(context):
+    points, mask = RULES.run(context)
+    
+    # Ensure score is within bounds
+    score = max(0, min(100, points))
+    
+    # Determine strength label
+    strength_label, color = get_strength_label(score)
+    
+    return AnalysisResult(score, strength_label, color, mask)
+
+def generate_suggestions(issues):
+    """Generate specific suggestions for an issue mask or a list of issue messages"""
+    mask = issues if isinstance(issues, int) else issue_mask(issues)
+    return list(SUGGESTION_TABLE[mask])
@@ -1,6 +1,4 @@
 import streamlit as st
-import re
-import math
 from collections import Counter
 import string
 import requests
@@ -639,18 +637,21 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 import os
+import wordlist
+import breach_corpus
+from guess_estimation import estimate_password_guesses
+import crack_time
+import policy_engine
+from analyzer import analyze_password_strength, calculate_entropy, shannon_entropy
+from incremental_analysis import IncrementalAnalyzer
+from analysis_cache import cached_analysis
 
-# Load common passwords from list.txt (40k+ most used passwords)
-COMMON_PASSWORDS = set()
-list_path = os.path.join(os.path.dirname(__file__), "list.txt")
-try:
-    with open(list_path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            pwd = line.strip().lower()
-            if pwd:
-                COMMON_PASSWORDS.add(pwd)
-except Exception as e:
-    st.warning(f"Could not load common password list: {e}")
+# Common passwords from list.txt (40k+ most used passwords), loaded once per
+# server process in a background thread and shared by every session, so the
+# page renders without waiting for it. The watcher hot-reloads it when
+# list.txt changes on disk.
+wordlist.start_background_load()
+wordlist.start_watcher()
 
 # --- Master Password Management ---
 def get_master_password_file():
@@ -809,157 +810,6 @@ def get_encryption_key_from_master_password(master_password):
 
 # --- History feature removed by user request ---
 
-def calculate_entropy(password):
-    """Calculate password entropy"""
-    if not password:
-        return 0
-    
-    charset_size = 0
-    if re.search(r'[a-z]', password):
-        charset_size += 26
-    if re.search(r'[A-Z]', password):
-        charset_size += 26
-    if re.search(r'[0-9]', password):
-        charset_size += 10
-    if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        charset_size += 32
-    
-    entropy = len(password) * math.log2(charset_size) if charset_size > 0 else 0
-    return round(entropy, 2)
-
-def check_repeating_patterns(password):
-    """Check for repeating characters and simple patterns"""
-    issues = []
-    
-    # Check for consecutive repeating characters
-    for i in range(len(password) - 2):
-        if password[i] == password[i+1] == password[i+2]:
-            issues.append("Contains 3+ consecutive repeating characters")
-            break
-    
-    # Check for simple sequences
-    sequences = ['123', '234', '345', '456', '567', '678', '789', 'abc', 'bcd', 'cde']
-    for seq in sequences:
-        if seq in password.lower():
-            issues.append("Contains simple sequences (123, abc, etc.)")
-            break
-    
-    # Check for keyboard patterns
-    keyboard_patterns = ['qwerty', 'asdf', 'zxcv', '1234', 'qwer']
-    for pattern in keyboard_patterns:
-        if pattern in password.lower():
-            issues.append("Contains keyboard patterns")
-            break
-            
-    return issues
-
-def analyze_password_strength(password):
-    """Analyze password strength and return score with details"""
-    if not password:
-        return 0, "No password entered", [], ""
-    
-    score = 0
-    feedback = []
-    issues = []
-    
-    # Length check (0-25 points)
-    length = len(password)
-    if length >= 12:
-        score += 25
-    elif length >= 8:
-        score += 15
-    elif length >= 6:
-        score += 10
-    else:
-        issues.append("Password too short (minimum 8 characters)")
-    
-    # Character variety (0-40 points total)
-    has_lower = bool(re.search(r'[a-z]', password))
-    has_upper = bool(re.search(r'[A-Z]', password))
-    has_digit = bool(re.search(r'[0-9]', password))
-    has_special = bool(re.search(r'[!@#$%^&*(),.?":{}|<>\-_+=\[\]\\\/~`]', password))
-    
-    char_variety = sum([has_lower, has_upper, has_digit, has_special])
-    score += char_variety * 10
-    
-    if not has_lower:
-        issues.append("Add lowercase letters")
-    if not has_upper:
-        issues.append("Add uppercase letters")
-    if not has_digit:
-        issues.append("Add numbers")
-    if not has_special:
-        issues.append("Add special characters (!@#$%^&*)")
-    
-    # Avoid common passwords (-20 points)
-    if password.lower() in COMMON_PASSWORDS:
-        score -= 20
-        issues.append("Avoid common passwords")
-    
-
-    
-    # Check for patterns (-10 points)
-    pattern_issues = check_repeating_patterns(password)
-    if pattern_issues:
-        score -= 10
-        issues.extend(pattern_issues)
-    
-    # Bonus for length > 12 (0-15 points)
-    if length > 12:
-        score += min(15, (length - 12) * 2)
-    
-    # Ensure score is within bounds
-    score = max(0, min(100, score))
-    
-    # Determine strength label
-    if score >= 80:
-        strength_label = "Very Strong"
-        color = "#00ff00"
-    elif score >= 60:
-        strength_label = "Strong"
-        color = "#90ee90"
-    elif score >= 40:
-        strength_label = "Moderate"
-        color = "#ffa500"
-    elif score >= 20:
-        strength_label = "Weak"
-        color = "#ff6347"
-    else:
-        strength_label = "Very Weak"
-        color = "#ff0000"
-    
-    return score, strength_label, issues, color
-
-def generate_suggestions(issues):
-    """Generate specific suggestions based on identified issues"""
-    suggestions = []
-    
-    if "Password too short (minimum 8 characters)" in issues:
-        suggestions.append("• Use at least 8 characters (12+ recommended)")
-    if "Add lowercase letters" in issues:
-        suggestions.append("• Include lowercase letters (a-z)")
-    if "Add uppercase letters" in issues:
-        suggestions.append("• Include uppercase letters (A-Z)")
-    if "Add numbers" in issues:
-        suggestions.append("• Include numbers (0-9)")
-    if "Add special characters (!@#$%^&*)" in issues:
-        suggestions.append("• Include special characters (!@#$%^&*)")
-    if "Avoid common passwords" in issues:
-        suggestions.append("• Avoid commonly used passwords")
-    if "Avoid common dictionary words" in issues:
-        suggestions.append("• Avoid dictionary words")
-    if any("repeating" in issue.lower() for issue in issues):
-        suggestions.append("• Avoid repeating characters")
-    if any("sequence" in issue.lower() for issue in issues):
-        suggestions.append("• Avoid simple sequences (123, abc)")
-    if any("keyboard" in issue.lower() for issue in issues):
-        suggestions.append("• Avoid keyboard patterns (qwerty)")
-    
-    if not suggestions:
-        suggestions.append("• Your password looks good! Consider making it even longer for extra security.")
-    
-    return suggestions
-
 def create_strength_meter(score, color, strength_label):
     """Create an enhanced visual strength meter with animations"""
     # Gradient colors based on strength
@@ -1296,12 +1146,52 @@ def main():
                 st.write("• No passwords are saved or stored anywhere")
                 st.write("• No data sent to external servers")
             
-            # Analyze password
-            score, strength_label, issues, color = analyze_password_strength(password)
+            # Analyze password: repeated inputs come from the shared cache, new ones reuse
+            # this session's state for the part that didn't change
+            if 'password_analyzer' not in st.session_state:
+                st.session_state.password_analyzer = IncrementalAnalyzer()
+            result = cached_analysis(password, st.session_state.password_analyzer.analyze)
+            score, strength_label, issues, color = result
             entropy = calculate_entropy(password)
+            guess_estimate = estimate_password_guesses(password)
             
             # Analysis completed
             st.info("✅ Password analysis completed!")
+            # The load error is only known once the background load has finished
+            load_error = wordlist.get_load_error()
+            if load_error is not None:
+                st.warning(f"Could not load common password list: {load_error}")
+            elif not wordlist.is_list_loaded():
+                st.info(f"⏳ The common password dictionary is still loading - this result was checked "
+                        f"against the {wordlist.PARTIAL_SIZE:,} most common passwords only")
+            elif not wordlist.is_ready():
+                st.info("⏳ The look-alike and embedded password checks are still loading - "
+                        "this result was checked against the full list of common passwords only")
+            
+            # Popular passwords are guessed after roughly rank attempts by list-based attacks
+            common_rank = wordlist.get_available_passwords().rank(password.lower())
+            if common_rank is not None:
+                st.warning(f"⚠️ This is common password #{common_rank:,} - an attacker working through "
+                           f"leaked password lists would guess it in about {common_rank:,} attempts")
+            
+            # Breach count from the offline SHA-1 corpus (no network access)
+            corpus = breach_corpus.get_breach_corpus()
+            breach_count = corpus.count(password) if corpus is not None else 0
+            if breach_count:
+                st.error(f"🚨 This password appears {breach_count:,} times in known data breaches")
+            
+            # Organizational policy, when PASSWORD_POLICY_PATH points at one
+            policy = policy_engine.get_policy()
+            if policy_engine.get_policy_error() is not None:
+                st.warning(f"⚠️ Could not load the password policy {policy_engine.POLICY_PATH}: "
+                           f"{policy_engine.get_policy_error()}")
+            elif policy is not None:
+                policy_result = policy.check(password)
+                if policy_result.passed:
+                    st.success(f"🏢 Meets the {policy.name} password policy")
+                else:
+                    st.error(f"🏢 Doesn't meet the {policy.name} password policy:\n\n"
+                             + "\n".join(f"- {message}" for message in policy_result.messages))
             
             # Display enhanced strength meter
             st.markdown("### 📊 Password Strength Analysis")
@@ -1313,7 +1203,7 @@ def main():
                        gap: 1rem; margin: 1rem 0;">
             """, unsafe_allow_html=True)
             
-            col_score, col_entropy, col_length = st.columns(3)
+            col_score, col_entropy, col_length, col_guesses = st.columns(4)
             with col_score:
                 delta_color = "normal" if score >= 60 else "inverse"
                 st.metric("🎯 Strength", f"{strength_label}", f"{score}/100", delta_color=delta_color)
@@ -1325,9 +1215,39 @@ def main():
                 length_status = "Good" if len(password) >= 12 else "OK" if len(password) >= 8 else "Short"
                 st.metric("📏 Length", f"{len(password)} chars", f"{length_status}", 
                          help="Longer passwords are generally stronger")
+            with col_guesses:
+                guesses_log10 = guess_estimate["guesses_log10"]
+                guesses_label = "High" if guesses_log10 >= 10 else "Medium" if guesses_log10 >= 6 else "Low"
+                st.metric("🎲 Guesses", f"10^{guesses_log10:.1f}", f"{guesses_label}",
+                         help="Estimated guesses for an attacker who tries common passwords, "
+                              "keyboard walks, sequences, repeats and dates first")
             
             st.markdown("</div>", unsafe_allow_html=True)
             
+            # How the guess estimate breaks the password down
+            with st.expander("🧩 Pattern Breakdown", expanded=False):
+                # Entropy from how often each character repeats, for comparison with the charset estimate
+                st.write(f"🔣 Character frequency (Shannon) entropy: {shannon_entropy(password)} bits")
+                for match in guess_estimate["sequence"]:
+                    st.write(f"• `{match['token']}` - {match['pattern']} "
+                             f"(about 10^{match['guesses_log10']:.1f} guesses)")
+                # Probabilistic estimate from a character model trained on list.txt
+                markov = wordlist.peek_markov_model()
+                if markov is not None:
+                    st.write(f"🧠 Character model: {markov.bits(password):.1f} bits "
+                             f"(about 10^{markov.guesses_log10(password):.1f} guesses for a model-guided attacker)")
+                # Structure-based estimate from a grammar learned from list.txt
+                pcfg = wordlist.peek_pcfg_model()
+                if pcfg is not None:
+                    structure, pcfg_log10 = pcfg.analyze(password)
+                    st.write(f"📐 Structure `{structure}`: about 10^{pcfg_log10:.1f} guesses "
+                             f"for a grammar-guided attacker")
+
+            # Time to reach the guess estimate at each attacker's rate
+            with st.expander("⏱️ Time to Crack", expanded=False):
+                for attacker, (seconds, display) in guess_estimate["crack_times"].items():
+                    st.write(f"• {crack_time.ATTACKER_DESCRIPTIONS[attacker]}: **{display}**")
+            
             # Enhanced suggestions section
             if issues:
                 st.markdown("""
@@ -1343,7 +1263,7 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
                 
-                suggestions = generate_suggestions(issues)
+                suggestions = result.suggestions
                 for i, suggestion in enumerate(suggestions):
                     st.markdown(f"""
                     <div style="background: rgba(220, 53, 69, 0.9); padding: 0.8rem; margin: 0.5rem 0; 
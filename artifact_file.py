@@ -0,0 +1,79 @@
+"""
+Password Strength Checker - Compiled Artifact Files
+Shared reading and writing of the files compiled from list.txt (the wordlist
+index, Bloom filter, substring matcher and Markov model).
+
+Each file starts with a little-endian struct header whose first two fields
+are an 8-byte magic and a format version, and which records the (size,
+mtime_ns) stamp of the list.txt it was built from. Files are written to a
+temporary name and renamed, so readers never see a partial file, and are
+memory-mapped for reading, so the pages are shared between processes.
+"""
+
+import mmap
+import os
+import sys
+from array import array
+
+import wordlist
+
+def to_little_endian(values):
+    """Return the bytes of an array in little-endian order"""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def write_file(dest, *chunks):
+    """Write the chunks to dest through a temporary file and rename it into place"""
+    tmp_path = dest + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, dest)
+
+def map_file(path, header, magic, version):
+    """Memory-map a compiled file and return (mmap, header fields)
+
+    Raises ValueError if the file is not this format and version.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < header.size:
+        mm.close()
+        raise ValueError(f"{path} is too small to be a compiled file")
+    fields = header.unpack_from(mm, 0)
+    if fields[0] != magic or fields[1] != version:
+        mm.close()
+        raise ValueError(f"{path} is not a version {version} {magic.decode()} file")
+    return mm, fields
+
+def matches_source(source_size, source_mtime, source=wordlist.WORDLIST_PATH):
+    """Check whether a recorded stamp is that of the current version of source"""
+    try:
+        return wordlist.source_stamp(source) == (source_size, source_mtime)
+    except OSError:
+        return False
+
+def open_current(path, header, magic, version, source, stamp_at, body_size, native_layout=False):
+    """Memory-map a compiled file built from the current source, returning (mmap, header fields) or None
+
+    stamp_at is the position of the source size in the header fields (the
+    mtime follows it), and body_size(fields) the number of bytes expected
+    after the header, or None if the fields describe a file that cannot be
+    used. Files whose arrays are read in place (native_layout) are only used
+    on little-endian hosts.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        mm, fields = map_file(path, header, magic, version)
+    except (OSError, ValueError):
+        return None
+    expected = body_size(fields)
+    if (expected is None or len(mm) != header.size + expected
+            or (native_layout and sys.byteorder != "little")
+            or not matches_source(fields[stamp_at], fields[stamp_at + 1], source)):
+        mm.close()
+        return None
+    return mm, fields
@@ -0,0 +1,306 @@
+"""
+Password Strength Checker - Batch Analysis
+Scores many passwords at once for audits of password exports.
+
+Passwords are packed into fixed-width arrays of code points so length,
+character classes, variety score, entropy and repeat detection run as
+vectorized NumPy operations. Rows are grouped by length first, so one very
+long password pads only its own group rather than the whole export, and
+repeated passwords are analyzed once. Sequences are found on the arrays too,
+and the keyboard walk and date checks only run on rows the arrays show could
+hold one. The dictionary lookups still run per password, and once the rules
+differ from the built-in ones (see analyzer.register_rule) the whole rule
+pipeline runs per password, in its own order. Every column matches
+analyzer.analyze_password_strength and analyzer.calculate_entropy exactly;
+python benchmark_batch.py checks that and compares the speed.
+"""
+
+import math
+
+import numpy as np
+
+import analyzer
+import keyboard_graphs
+import wordlist
+
+# Class codes are the bytes of analyzer's Unicode class table; padding gets its own code
+_PAD = 255
+
+# Rows up to this length are packed together; longer ones by power-of-two length
+_MIN_GROUP_WIDTH = 32
+
+# Grid code of every ASCII character on each keyboard layout, as lookup arrays
+_GRID_ARRAYS = [np.frombuffer(layout.grid_codes[:128], dtype=np.uint8).astype(np.int16)
+                for layout in keyboard_graphs.LAYOUTS.values()]
+_ADJACENT_STEPS = np.array(sorted(keyboard_graphs.ADJACENT_STEPS), dtype=np.int16)
+
+# Loaded copy of the common password list for exact lookups, with the list it was built from
+_ranked_source = None
+_ranked_passwords = None
+
+_LABELS = ["Very Weak", "Weak", "Moderate", "Strong", "Very Strong"]
+_COLORS = [analyzer.get_strength_label(score)[1] for score in (0, 20, 40, 60, 80)]
+
+def pack_passwords(passwords):
+    """Pack passwords into an (n, width) uint32 code point array plus their lengths"""
+    lengths = np.fromiter((len(p) for p in passwords), dtype=np.int64, count=len(passwords))
+    width = int(lengths.max()) if len(passwords) else 0
+    if width == 0:
+        return np.zeros((len(passwords), 0), dtype=np.uint32), lengths
+    packed = "".join(p.ljust(width, "\0") for p in passwords).encode("utf-32-le", "surrogatepass")
+    codes = np.frombuffer(packed, dtype="<u4").reshape(len(passwords), width)
+    return codes, lengths
+
+def _classify(codes, lengths):
+    """Map every code point to its class byte, marking padding"""
+    # Look up each code point in the 256-entry block of the class table it falls in
+    blocks = codes >> 8
+    needed = np.unique(blocks)
+    table = np.frombuffer(b"".join(analyzer.unicode_block(int(block)) for block in needed),
+                          dtype=np.uint8).reshape(-1, 256)
+    classes = table[np.searchsorted(needed, blocks), codes & 0xFF]
+    padding = np.arange(codes.shape[1]) >= lengths[:, None]
+    classes[padding] = _PAD
+    return classes
+
+# Larger than any charset size, so (length, charset size) pairs pack into one key
+_KEY_SPAN = 1 + sum(analyzer.CHARSET_SIZES.values())
+
+def _entropy(lengths, charset_sizes):
+    """Entropy for each password, rounded exactly like calculate_entropy
+
+    Entropy depends only on (length, charset size), so each distinct pair is
+    computed once with math.log2 and round() and broadcast back.
+    """
+    keys = lengths * _KEY_SPAN + charset_sizes
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    values = np.array([
+        round(int(k // _KEY_SPAN) * math.log2(int(k % _KEY_SPAN)), 2) if k % _KEY_SPAN and k // _KEY_SPAN else 0
+        for k in unique_keys
+    ], dtype=np.float64)
+    return values[inverse.reshape(-1)]
+
+def _repeat_runs(codes, lengths):
+    """True where a password contains three identical characters in a row"""
+    if codes.shape[1] < 3:
+        return np.zeros(len(lengths), dtype=bool)
+    same = (codes[:, :-2] == codes[:, 1:-1]) & (codes[:, 1:-1] == codes[:, 2:])
+    inside = np.arange(codes.shape[1] - 2) + 2 < lengths[:, None]
+    return (same & inside).any(axis=1)
+
+def _group_width(length):
+    """Packed width of a password's group, so no row is padded to more than twice its length"""
+    return max(_MIN_GROUP_WIDTH, 1 << max(length - 1, 0).bit_length())
+
+def _runs(flags, length):
+    """True where a row of flags has length consecutive True values"""
+    if flags.shape[1] < length:
+        return np.zeros(len(flags), dtype=bool)
+    width = flags.shape[1] - length + 1
+    run = flags[:, :width].copy()
+    for k in range(1, length):
+        run &= flags[:, k:k + width]
+    return run.any(axis=1)
+
+def _sequence_rows(lowered_codes):
+    """analyzer.has_sequence for rows of ASCII code points"""
+    letters = (lowered_codes >= ord("a")) & (lowered_codes <= ord("z"))
+    digits = (lowered_codes >= ord("0")) & (lowered_codes <= ord("9"))
+    linked = (letters | digits)[:, 1:] & (letters | digits)[:, :-1]
+    steps = lowered_codes[:, 1:].astype(np.int64) - lowered_codes[:, :-1]
+    return _runs(linked & (steps == 1), 2) | _runs(linked & (steps == -1), 2)
+
+def _keyboard_rows(lowered_codes, lengths):
+    """True for rows of ASCII code points that may hold a keyboard walk on some layout
+
+    The same test as keyboard_graphs' prefilter: MIN_KEYBOARD_WALK keys in a
+    row that are adjacent on one layout.
+    """
+    found = np.zeros(len(lengths), dtype=bool)
+    if lowered_codes.shape[1] < 2:
+        return found
+    inside = np.arange(1, lowered_codes.shape[1]) < lengths[:, None]
+    for grid in _GRID_ARRAYS:
+        keys = grid[lowered_codes]
+        adjacent = np.isin(keys[:, 1:] - keys[:, :-1], _ADJACENT_STEPS) & inside
+        found |= _runs(adjacent, analyzer.MIN_KEYBOARD_WALK - 1)
+    return found
+
+def _date_rows(codes):
+    """True for rows that may hold a date: every reading, separated or not, has four or more digits"""
+    return ((codes >= ord("0")) & (codes <= ord("9"))).sum(axis=1) >= 4
+
+def _ranked_list():
+    """The full common password list as an in-memory RankedWordlist, built once per loaded list"""
+    global _ranked_source, _ranked_passwords
+    common = wordlist.get_common_passwords()
+    if isinstance(common, wordlist.RankedWordlist):
+        return common
+    if common is not _ranked_source:
+        # Memory-mapped indexes are searched per lookup; a batch looks up every row
+        _ranked_passwords = wordlist.RankedWordlist(dict(common.items()))
+        _ranked_source = common
+    return _ranked_passwords
+
+def analyze_many(passwords, models=False):
+    """Analyze a sequence of passwords, returning a dict of columns
+
+    Columns: length, has_lower, has_upper, has_digit, has_special, variety,
+    entropy, score, issue_mask (NumPy arrays) and strength, color, issues
+    (lists), in the same order as the input. With models=True, markov_bits
+    and pcfg_guesses_log10 are added (NumPy arrays; markov_bits is NaN
+    without a compiled model).
+    """
+    passwords = list(passwords)
+    # Every row is checked against the full wordlist, even while the app is still loading it
+    if models:
+        wordlist.load_all()
+    else:
+        wordlist.load_dictionary()
+    common = _ranked_list()
+
+    # Exports repeat passwords, so each distinct one is analyzed once
+    unique = list(dict.fromkeys(passwords))
+    groups = {}
+    for i, password in enumerate(unique):
+        groups.setdefault(_group_width(len(password)), []).append(i)
+    if len(groups) <= 1:
+        columns = _analyze_group(unique, common, models)
+    else:
+        columns = {}
+        for rows in groups.values():
+            part = _analyze_group([unique[i] for i in rows], common, models)
+            for name, values in part.items():
+                column = columns.get(name)
+                if column is None:
+                    if isinstance(values, np.ndarray):
+                        column = np.empty(len(unique), dtype=values.dtype)
+                    else:
+                        column = [None] * len(unique)
+                    columns[name] = column
+                if isinstance(column, np.ndarray):
+                    column[rows] = values
+                else:
+                    for i, value in zip(rows, values):
+                        column[i] = value
+
+    if len(unique) < len(passwords):
+        position = {password: i for i, password in enumerate(unique)}
+        rows = np.fromiter((position[p] for p in passwords), dtype=np.int64, count=len(passwords))
+        row_list = rows.tolist()
+        columns = {name: values[rows] if isinstance(values, np.ndarray) else [values[i] for i in row_list]
+                   for name, values in columns.items()}
+    columns["issues"] = [list(analyzer.ISSUE_TABLE[mask]) for mask in columns["issue_mask"].tolist()]
+    return columns
+
+def _analyze_group(passwords, common, models):
+    """analyze_many for one group of distinct passwords packed into a single array"""
+    codes, lengths = pack_passwords(passwords)
+    classes = _classify(codes, lengths)
+
+    present = {cls: (classes == ord(cls)).any(axis=1) for cls in analyzer.CHARSET_SIZES}
+    has_lower = present[analyzer.LOWER] | present[analyzer.INTL_LOWER] | present[analyzer.UNCASED]
+    has_upper = present[analyzer.UPPER] | present[analyzer.INTL_UPPER]
+    has_digit = present[analyzer.DIGIT] | present[analyzer.INTL_DIGIT]
+    has_special = present[analyzer.SYMBOL] | present[analyzer.SPECIAL]
+    variety = has_lower.astype(np.int64) + has_upper + has_digit + has_special
+
+    charset_sizes = sum(size * present[cls].astype(np.int64) for cls, size in analyzer.CHARSET_SIZES.items())
+    entropy = _entropy(lengths, charset_sizes)
+    repeats = _repeat_runs(codes, lengths)
+
+    # Length points (0-25) and the bonus beyond 12 characters (0-15)
+    length_points = np.select([lengths >= 12, lengths >= 8, lengths >= 6], [25, 15, 10], 0)
+    bonus = np.clip((lengths - 12) * 2, 0, 15)
+    score = length_points + variety * 10 + bonus
+
+    # Sequences are found on the arrays for ASCII rows; keyboard walks and
+    # dates are only looked for in rows that could hold one
+    ascii_rows = (codes < 128).all(axis=1)
+    ascii_codes = np.where(ascii_rows[:, None], codes, 0)
+    lowered_codes = np.where((ascii_codes >= ord("A")) & (ascii_codes <= ord("Z")), ascii_codes + 32, ascii_codes)
+    sequences = _sequence_rows(lowered_codes) & ascii_rows
+    check_keyboard = _keyboard_rows(lowered_codes, lengths) | ~ascii_rows
+    check_date = _date_rows(codes)
+
+    # Embedded common passwords are searched for in every ASCII row at once
+    matcher = wordlist.get_substring_matcher()
+    if matcher is not None:
+        embedded = matcher.hits_packed(lowered_codes, np.where(ascii_rows, lengths, 0))
+    else:
+        embedded = np.zeros(len(passwords), dtype=bool)
+
+    # Length and class issues as vectorized issue bits
+    issue_masks = (analyzer.TOO_SHORT * (lengths < 6) | analyzer.NO_LOWER * ~has_lower
+                   | analyzer.NO_UPPER * ~has_upper | analyzer.NO_DIGIT * ~has_digit
+                   | analyzer.NO_SPECIAL * ~has_special | analyzer.REPEATING * repeats
+                   | analyzer.SEQUENCE * sequences).astype(np.int64)
+
+    # Dictionary lookups stay per password. Once the rules differ from the
+    # built-in ones, the whole pipeline runs per password in its own order,
+    # with the pattern answers found above
+    custom_rules = set(analyzer.RULES) != analyzer.BUILTIN_RULES
+    penalties = np.zeros(len(passwords), dtype=np.int64)
+    for i, (password, mask, is_ascii, keyboard, date, found) in enumerate(zip(
+            passwords, issue_masks.tolist(), ascii_rows.tolist(), check_keyboard.tolist(),
+            check_date.tolist(), embedded.tolist())):
+        if not password:
+            issue_masks[i] = 0
+            continue
+        lowered = password.lower()
+        if not is_ascii and analyzer.has_sequence(lowered):
+            mask |= analyzer.SEQUENCE
+        if keyboard and analyzer.find_keyboard_patterns(lowered):
+            mask |= analyzer.KEYBOARD
+        if date:
+            mask |= analyzer.date_issue_mask(password)
+        embedded_found = found if is_ascii else None
+
+        if custom_rules:
+            context = analyzer.CheckContext(password, analyzer.PasswordProfile(password),
+                                            mask & analyzer.PATTERN_ISSUES, embedded_found)
+            points, mask = analyzer.RULES.run(context)
+            # The pipeline's points replace the vectorized score
+            penalty = int(score[i]) - points
+        else:
+            penalty, dictionary_mask = analyzer.dictionary_issue_mask(password, lowered, embedded_found,
+                                                                      common_passwords=common)
+            mask |= dictionary_mask
+            if mask & analyzer.PATTERN_ISSUES:
+                penalty += 10
+        penalties[i] = penalty
+        issue_masks[i] = mask
+
+    score = np.clip(score - penalties, 0, 100)
+    band = np.searchsorted([20, 40, 60, 80], score, side="right")
+    empty = lengths == 0
+    score[empty] = 0
+    strength = ["No password entered" if empty[i] else _LABELS[b] for i, b in enumerate(band)]
+    color = ["" if empty[i] else _COLORS[b] for i, b in enumerate(band)]
+
+    columns = {
+        "length": lengths,
+        "has_lower": has_lower,
+        "has_upper": has_upper,
+        "has_digit": has_digit,
+        "has_special": has_special,
+        "variety": variety,
+        "entropy": entropy,
+        "score": score,
+        "strength": strength,
+        "color": color,
+        "issue_mask": issue_masks,
+    }
+    if models:
+        # Character model bits, when the compiled model is available
+        model = wordlist.get_markov_model()
+        if model is not None and len(passwords):
+            columns["markov_bits"] = model.bits_packed(codes, lengths)
+        else:
+            columns["markov_bits"] = np.full(len(passwords), np.nan)
+
+        # PCFG guess numbers are table lookups per password
+        grammar = wordlist.get_pcfg_model()
+        columns["pcfg_guesses_log10"] = np.fromiter((grammar.analyze(p)[1] for p in passwords),
+                                                    dtype=np.float64, count=len(passwords))
+    return columns
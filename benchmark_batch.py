@@ -0,0 +1,67 @@
+"""
+Password Strength Checker - Batch Benchmark
+Compares the throughput of batch analysis (batch_analysis.analyze_many)
+with analyzing the same passwords one at a time in a plain loop
+(analyzer.analyze_password_strength and analyzer.calculate_entropy), and
+checks that both give the same score, label, color, issues and entropy for
+every password.
+
+Run it with:
+    python benchmark_batch.py [count]
+"""
+
+import sys
+import time
+
+import analyzer
+import wordlist
+from batch_analysis import analyze_many
+from benchmark_verdict import sample_passwords
+
+def plain_loop(passwords):
+    """The per-password results analyze_many replaces"""
+    return [(analyzer.analyze_password_strength(password), analyzer.calculate_entropy(password))
+            for password in passwords]
+
+def count_mismatches(passwords, results, columns):
+    mismatches = 0
+    for i, (result, entropy) in enumerate(results):
+        if (result.score != columns["score"][i] or result.label != columns["strength"][i]
+                or result.color != columns["color"][i] or result.issue_mask != columns["issue_mask"][i]
+                or entropy != columns["entropy"][i]):
+            mismatches += 1
+    return mismatches
+
+def best_time(function, passwords, repeats=3):
+    """Fastest of a few runs, since one run is easily slowed down by other load"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(passwords)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Load every structure up front so neither side pays for it
+    wordlist.load_dictionary()
+    passwords = sample_passwords(count)
+    distinct = len(set(passwords))
+
+    mismatches = count_mismatches(passwords, plain_loop(passwords), analyze_many(passwords))
+    loop_time = best_time(plain_loop, passwords)
+    batch_time = best_time(analyze_many, passwords)
+    unique_passwords = list(dict.fromkeys(passwords))
+    unique_loop_time = best_time(plain_loop, unique_passwords)
+    unique_batch_time = best_time(analyze_many, unique_passwords)
+
+    print(f"📊 {count:,} passwords, {distinct:,} distinct")
+    print(f"🐢 Plain loop:    {loop_time:.2f} s")
+    print(f"⚡ analyze_many:  {batch_time:.2f} s ({loop_time / batch_time:.1f}x)")
+    print(f"🔁 Distinct only: {unique_loop_time:.2f} s loop, {unique_batch_time:.2f} s batch "
+          f"({unique_loop_time / unique_batch_time:.1f}x)")
+    if mismatches:
+        print(f"❌ {mismatches:,} batch results disagree with the plain loop")
+        sys.exit(1)
+    print("✅ Batch results match the plain loop")
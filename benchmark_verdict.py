@@ -0,0 +1,64 @@
+"""
+Password Strength Checker - Verdict Benchmark
+Compares the throughput of the pass/fail verdict (analyzer.is_acceptable)
+with full analysis (analyzer.analyze_password_strength) on a mix of common
+passwords, short variations of them and random strong passwords, and checks
+that both agree on every password.
+
+Run it with:
+    python benchmark_verdict.py [count]
+"""
+
+import random
+import string
+import sys
+import time
+
+import analyzer
+import wordlist
+
+def sample_passwords(count, seed=42):
+    """A reproducible mix: half common passwords, a quarter tweaked ones, a quarter random"""
+    rng = random.Random(seed)
+    common = list(wordlist.get_common_passwords())
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*-_"
+    passwords = []
+    for i in range(count):
+        kind = i % 4
+        if kind < 2:
+            passwords.append(rng.choice(common))
+        elif kind == 2:
+            base = rng.choice(common)
+            passwords.append(base.capitalize() + str(rng.randint(0, 2030)) + rng.choice("!@#$"))
+        else:
+            passwords.append("".join(rng.choice(alphabet) for _ in range(rng.randint(10, 20))))
+    return passwords
+
+def throughput(function, passwords):
+    start = time.perf_counter()
+    for password in passwords:
+        function(password)
+    return len(passwords) / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Load every structure up front so neither side pays for it
+    wordlist.get_common_passwords()
+    wordlist.get_leet_index()
+    wordlist.get_substring_matcher()
+    passwords = sample_passwords(count)
+
+    threshold = analyzer.MIN_ACCEPTABLE_SCORE
+    mismatches = sum(1 for password in passwords
+                     if analyzer.is_acceptable(password) != (analyzer.analyze_password_strength(password).score >= threshold))
+    full_rate = throughput(analyzer.analyze_password_strength, passwords)
+    verdict_rate = throughput(analyzer.is_acceptable, passwords)
+    accepted = sum(1 for password in passwords if analyzer.is_acceptable(password))
+
+    print(f"📊 {count:,} passwords, {accepted:,} acceptable (score >= {threshold})")
+    print(f"🐢 Full analysis: {full_rate:,.0f} passwords/second")
+    print(f"⚡ Verdict:       {verdict_rate:,.0f} passwords/second ({verdict_rate / full_rate:.1f}x)")
+    if mismatches:
+        print(f"❌ {mismatches:,} verdicts disagree with full analysis")
+        sys.exit(1)
+    print("✅ Verdicts match full analysis")
@@ -0,0 +1,130 @@
+"""
+Password Strength Checker - Bloom Filter Pre-check
+A compact probabilistic filter over list.txt that answers "definitely not a
+common password" before the exact index is consulted. Only filter positives
+go on to the memory-mapped index, so most lookups never touch its pages.
+
+Build it (after wordlist_index.py) with:
+    python bloom_filter.py [false_positive_rate]
+"""
+
+import hashlib
+import math
+import os
+import struct
+import sys
+
+import artifact_file
+import wordlist
+
+# Default location of the compiled filter, next to list.txt
+FILTER_PATH = os.path.splitext(wordlist.WORDLIST_PATH)[0] + ".bloom"
+DEFAULT_FP_RATE = 0.01
+
+MAGIC = b"PSCBLOOM"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQIQQ")
+HASH_PAIR = struct.Struct("<QQ")
+
+def optimal_parameters(count, fp_rate=DEFAULT_FP_RATE):
+    """Return the (bit count, hash count) giving the target false-positive rate"""
+    if not 0 < fp_rate < 1:
+        raise ValueError("False-positive rate must be between 0 and 1")
+    count = max(count, 1)
+    bit_count = max(64, int(math.ceil(-count * math.log(fp_rate) / (math.log(2) ** 2))))
+    hash_count = max(1, int(round(bit_count / count * math.log(2))))
+    return bit_count, hash_count
+
+def _hash_pair(password):
+    """Two independent 64-bit hashes for double hashing (stable across processes)"""
+    digest = hashlib.blake2b(password.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    h1, h2 = HASH_PAIR.unpack(digest)
+    return h1, h2 | 1
+
+class BloomFilter:
+    """Bit array with k probe positions per entry derived by double hashing"""
+
+    def __init__(self, bit_count, hash_count, bits=None):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self._bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+
+    def add(self, password):
+        h1, h2 = _hash_pair(password)
+        bits = self._bits
+        for i in range(self.hash_count):
+            pos = (h1 + i * h2) % self.bit_count
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, password):
+        h1, h2 = _hash_pair(password)
+        bits = self._bits
+        bit_count = self.bit_count
+        for i in range(self.hash_count):
+            pos = (h1 + i * h2) % bit_count
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def size_bytes(self):
+        return len(self._bits)
+
+class FilteredWordlist:
+    """Common password collection with a Bloom filter in front of exact lookups"""
+
+    def __init__(self, bloom, exact):
+        self.bloom = bloom
+        self.exact = exact
+
+    def __len__(self):
+        return len(self.exact)
+
+    def __iter__(self):
+        return iter(self.exact)
+
+    def items(self):
+        return self.exact.items()
+
+    def __contains__(self, password):
+        # The filter has no false negatives, so only its positives need confirming
+        return password in self.bloom and password in self.exact
+
+    def rank(self, password):
+        """Return the popularity rank, skipping the index for filter misses"""
+        if password not in self.bloom:
+            return None
+        return self.exact.rank(password)
+
+def build_filter(source=wordlist.WORDLIST_PATH, dest=FILTER_PATH, fp_rate=DEFAULT_FP_RATE):
+    """Compile a wordlist text file into a Bloom filter file, returning the filter"""
+    entries = wordlist.load_common_passwords(source)
+    bit_count, hash_count = optimal_parameters(len(entries), fp_rate)
+    bloom = BloomFilter(bit_count, hash_count)
+    for pwd in entries:
+        bloom.add(pwd)
+
+    source_size, source_mtime = wordlist.source_stamp(source)
+    header = HEADER.pack(MAGIC, VERSION, hash_count, bit_count, len(entries),
+                         source_size, source_mtime)
+    artifact_file.write_file(dest, header, bloom._bits)
+    return bloom
+
+def open_current_filter(path=FILTER_PATH, source=wordlist.WORDLIST_PATH):
+    """Memory-map the compiled filter if it exists and matches list.txt, otherwise return None
+
+    A filter built from an older list could answer "not common" for a newly
+    added entry, so a stale filter is never used.
+    """
+    opened = artifact_file.open_current(path, HEADER, MAGIC, VERSION, source, stamp_at=5,
+                                        body_size=lambda fields: (fields[3] + 7) // 8)
+    if opened is None:
+        return None
+    mm, (_, _, hash_count, bit_count, _, _, _) = opened
+    return BloomFilter(bit_count, hash_count, memoryview(mm)[HEADER.size:])
+
+if __name__ == "__main__":
+    fp_rate = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FP_RATE
+    bloom = build_filter(fp_rate=fp_rate)
+    print(f"✅ Built Bloom filter: {bloom.size_bytes} bytes, {bloom.hash_count} hashes, "
+          f"target false-positive rate {fp_rate}")
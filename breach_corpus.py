@@ -0,0 +1,139 @@
+"""
+Password Strength Checker - Offline Breach Corpus
+Checks passwords against a local copy of a Pwned-Passwords-style SHA-1 dump
+without any network access.
+
+The public dumps are text files of "SHA1HEX:count" lines. They are converted
+once into a fixed-width binary file of sorted 24-byte records (20-byte SHA-1
+digest + uint32 big-endian count) that is memory-mapped and searched with
+interpolation search, so a lookup touches only a handful of pages even for
+hundreds of millions of hashes.
+
+Convert a dump (the "ordered by hash" download) with:
+    python breach_corpus.py pwned-passwords-sha1-ordered-by-hash.txt [pwned.bin]
+
+Set BREACH_CORPUS_PATH to use a corpus stored elsewhere.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+
+# Default location of the converted corpus
+CORPUS_PATH = os.environ.get(
+    "BREACH_CORPUS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "pwned.bin"),
+)
+
+MAGIC = b"PSCPWND1"
+HEADER = struct.Struct(">8sQ")
+RECORD = struct.Struct(">20sI")
+PREFIX = struct.Struct(">Q")
+MAX_COUNT = 0xFFFFFFFF
+
+_lock = threading.Lock()
+_NOT_LOADED = object()
+_corpus = _NOT_LOADED
+
+def convert_corpus(source, dest=CORPUS_PATH):
+    """Convert a sorted "SHA1HEX:count" text dump into the binary corpus, returning the record count"""
+    count = 0
+    previous = b""
+    tmp_path = dest + ".tmp"
+    with open(source, "r", encoding="ascii", errors="ignore") as src, open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, 0))
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            digest_hex, _, occurrences = line.partition(":")
+            digest = bytes.fromhex(digest_hex)
+            if len(digest) != 20:
+                raise ValueError(f"Not a SHA-1 line: {line[:60]}")
+            if digest <= previous:
+                raise ValueError("Dump is not ordered by hash; use the 'ordered by hash' download")
+            out.write(RECORD.pack(digest, min(int(occurrences or 1), MAX_COUNT)))
+            previous = digest
+            count += 1
+        # Record count goes in the header once it is known
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, count))
+    os.replace(tmp_path, dest)
+    return count
+
+class BreachCorpus:
+    """Memory-mapped sorted SHA-1 records searched by interpolation"""
+
+    def __init__(self, path=CORPUS_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            self._mm.close()
+            raise ValueError(f"{path} is too small to be a breach corpus")
+        magic, self._count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or len(self._mm) != HEADER.size + self._count * RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path} is not a breach corpus")
+
+    def __len__(self):
+        return self._count
+
+    def _prefix(self, i):
+        return PREFIX.unpack_from(self._mm, HEADER.size + i * RECORD.size)[0]
+
+    def count_digest(self, digest):
+        """Return how many times a SHA-1 digest appears in breaches (0 if never)"""
+        target = PREFIX.unpack_from(digest)[0]
+        mm = self._mm
+        lo, hi = 0, self._count - 1
+        while lo <= hi:
+            lo_key, hi_key = self._prefix(lo), self._prefix(hi)
+            if target < lo_key or target > hi_key:
+                return 0
+            # SHA-1 digests are uniform, so the target's position is predictable
+            if hi_key == lo_key:
+                mid = (lo + hi) // 2
+            else:
+                mid = lo + (target - lo_key) * (hi - lo) // (hi_key - lo_key)
+            record_digest, occurrences = RECORD.unpack_from(mm, HEADER.size + mid * RECORD.size)
+            if record_digest < digest:
+                lo = mid + 1
+            elif record_digest > digest:
+                hi = mid - 1
+            else:
+                return occurrences
+        return 0
+
+    def count(self, password):
+        """Return how many times a password appears in breaches (0 if never)"""
+        return self.count_digest(hashlib.sha1(password.encode("utf-8", "surrogatepass")).digest())
+
+    def close(self):
+        self._mm.close()
+
+def get_breach_corpus():
+    """Return the shared breach corpus, or None if no converted corpus is installed"""
+    global _corpus
+    corpus = _corpus
+    if corpus is not _NOT_LOADED:
+        return corpus
+
+    with _lock:
+        if _corpus is _NOT_LOADED:
+            try:
+                _corpus = BreachCorpus(CORPUS_PATH) if os.path.exists(CORPUS_PATH) else None
+            except (OSError, ValueError):
+                _corpus = None
+        return _corpus
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python breach_corpus.py <sha1-dump.txt> [pwned.bin]")
+        sys.exit(1)
+    dest = sys.argv[2] if len(sys.argv) > 2 else CORPUS_PATH
+    records = convert_corpus(sys.argv[1], dest)
+    print(f"✅ Converted {records} breached password hashes into {dest}")
@@ -0,0 +1,29 @@
+"""
+Password Strength Checker - Byte Steps
+The difference of every byte from the one before it, computed at once.
+
+The bytes are read as one big integer and shifted right by a byte, so the
+subtraction runs in C however long the input is. Setting 0x80 in each byte
+first means bytes below 0x80 never borrow from their neighbours, and every
+step comes out as 0x80 plus the signed difference: 0x81 for +1, 0x7f for -1.
+The sequence and keyboard walk prefilters both look for runs of these.
+"""
+
+# Lengths up to this keep their high-bit mask once computed
+MAX_CACHED_LENGTH = 1024
+_HIGH_BITS = {}
+
+def high_bits(n):
+    """0x80 in each of n bytes, as an integer"""
+    high = _HIGH_BITS.get(n)
+    if high is None:
+        high = int.from_bytes(b"\x80" * n, "big")
+        if n < MAX_CACHED_LENGTH:
+            _HIGH_BITS[n] = high
+    return high
+
+def byte_steps(data):
+    """Return 0x80 + data[i] - data[i - 1] for every byte (data[-1] read as 0); bytes must be below 0x80"""
+    n = len(data)
+    codes = int.from_bytes(data, "big")
+    return ((codes | high_bits(n)) - (codes >> 8)).to_bytes(n, "big")
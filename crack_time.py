@@ -0,0 +1,55 @@
+"""
+Password Strength Checker - Crack Time Estimation
+Turns a guess estimate into the time four kinds of attacker need to reach
+it, from the slowest (a throttled login form) to the fastest (a GPU rig
+against a leaked fast hash). Rates and display units are tables built once
+at import, so each estimate is a subtraction and a bisect per attacker.
+"""
+
+import math
+from bisect import bisect_right
+
+# (key, description, guesses per second)
+ATTACKERS = [
+    ("online_throttled", "Online attack, throttled (100 guesses/hour)", 100 / 3600),
+    ("online_unthrottled", "Online attack, unthrottled (10 guesses/second)", 10),
+    ("offline_slow_hash", "Offline attack, slow hash like bcrypt (10k guesses/second)", 1e4),
+    ("offline_fast_hash", "Offline attack, fast hash like SHA-1 (10B guesses/second)", 1e10),
+]
+ATTACKER_DESCRIPTIONS = {key: description for key, description, _ in ATTACKERS}
+_LOG10_RATES = [(key, math.log10(rate)) for key, _, rate in ATTACKERS]
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+MONTH = 31 * DAY
+YEAR = 365 * DAY
+CENTURY = 100 * YEAR
+
+# Display units in increasing size; a time is shown in the largest unit it reaches
+TIME_UNITS = [(1, "second"), (MINUTE, "minute"), (HOUR, "hour"), (DAY, "day"),
+              (MONTH, "month"), (YEAR, "year")]
+_LOG10_UNITS = [math.log10(size) for size, _ in TIME_UNITS]
+_LOG10_CENTURY = math.log10(CENTURY)
+
+# Beyond this a time in seconds no longer fits in a float
+MAX_LOG10_SECONDS = 300
+
+def display_time(log10_seconds):
+    """Return a readable duration ("3 hours", "centuries") for a log10 number of seconds"""
+    if log10_seconds < 0:
+        return "less than a second"
+    if log10_seconds >= _LOG10_CENTURY:
+        return "centuries"
+    size, name = TIME_UNITS[bisect_right(_LOG10_UNITS, log10_seconds) - 1]
+    count = round(10 ** log10_seconds / size)
+    return f"{count} {name}" if count == 1 else f"{count} {name}s"
+
+def estimate_crack_times(guesses_log10):
+    """Return {attacker: (seconds, display)} for a log10 guess estimate"""
+    times = {}
+    for key, log10_rate in _LOG10_RATES:
+        log10_seconds = guesses_log10 - log10_rate
+        seconds = 10 ** min(log10_seconds, MAX_LOG10_SECONDS)
+        times[key] = (seconds, display_time(log10_seconds))
+    return times
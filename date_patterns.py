@@ -0,0 +1,169 @@
+"""
+Password Strength Checker - Date Patterns
+Finds the years and dates people put in passwords ("alice1987", "0412",
+"12/04/87", "19870412"), which an attacker guesses from a few thousand
+plausible days rather than as random digits.
+
+Every valid reading is precomputed once as a string lookup table: years
+("87", "1987"), day-month and month-day pairs ("0412", "1204") and which
+years are leap years. Detection scans each run of digits once and checks
+at most three windows (8, 6 and 4 digits) per position with a handful of
+table lookups each, so it runs in linear time with no parsing per candidate.
+Separated dates ("4/12/87", "1987-04-12") are found by one regex pass.
+
+Matches are dicts in the pattern_matching format (pattern "date", inclusive
+i..j, token, separator, year, month, day); year is None for a bare day and
+month ("0412").
+"""
+
+import calendar
+import re
+from datetime import date
+
+REFERENCE_YEAR = date.today().year
+FIRST_YEAR = 1900
+LAST_YEAR = 2099
+
+# Years too close to the present are still guessed from a range this wide
+MIN_YEAR_SPACE = 20
+DAYS_IN_YEAR = 366
+
+# "1987" -> 1987 and "87" -> 1987, "07" -> 2007 (two-digit years up to 50 are this century)
+YEARS = {str(year): year for year in range(FIRST_YEAR, LAST_YEAR + 1)}
+YEARS.update({f"{yy:02d}": yy + 1900 if yy > 50 else yy + 2000 for yy in range(100)})
+LEAP_YEARS = frozenset(year for year in range(FIRST_YEAR, LAST_YEAR + 1) if calendar.isleap(year))
+
+# Zero-padded "DDMM" and "MMDD" -> (month, day) for every day of the year, February 29 included
+DAY_MONTHS = {}
+MONTH_DAYS = {}
+for _month in range(1, 13):
+    for _day in range(1, calendar.monthrange(2000, _month)[1] + 1):
+        DAY_MONTHS[f"{_day:02d}{_month:02d}"] = (_month, _day)
+        MONTH_DAYS[f"{_month:02d}{_day:02d}"] = (_month, _day)
+
+DIGIT_RUN = re.compile(r"[0-9]+")
+# Day, month and year in some order around a repeated separator; fields are read from the tables
+SEPARATED_DATE = re.compile(r"(?<![0-9])([0-9]{1,4})([\s/\\_.-])([0-9]{1,2})\2([0-9]{2}|[0-9]{4})(?![0-9])")
+
+def _valid(year, month_day):
+    """The (year, month, day) of a reading, or None if it is February 29 of a common year"""
+    month, day = month_day
+    if month == 2 and day == 29 and year not in LEAP_YEARS:
+        return None
+    return year, month, day
+
+def _nearest(readings):
+    """Of several readings of the same digits, the one nearest the present"""
+    best = None
+    for reading in readings:
+        if reading is not None and (best is None or abs(reading[0] - REFERENCE_YEAR) < abs(best[0] - REFERENCE_YEAR)):
+            best = reading
+    return best
+
+def _read_8(token):
+    # YYYYMMDD, DDMMYYYY, MMDDYYYY
+    readings = []
+    if token[:4] in YEARS and token[4:] in MONTH_DAYS:
+        readings.append(_valid(YEARS[token[:4]], MONTH_DAYS[token[4:]]))
+    year = YEARS.get(token[4:])
+    if year is not None:
+        if token[:4] in DAY_MONTHS:
+            readings.append(_valid(year, DAY_MONTHS[token[:4]]))
+        if token[:4] in MONTH_DAYS:
+            readings.append(_valid(year, MONTH_DAYS[token[:4]]))
+    return _nearest(readings)
+
+def _read_6(token):
+    # YYMMDD, DDMMYY, MMDDYY
+    readings = []
+    if token[2:] in MONTH_DAYS:
+        readings.append(_valid(YEARS[token[:2]], MONTH_DAYS[token[2:]]))
+    year = YEARS[token[4:]]
+    if token[:4] in DAY_MONTHS:
+        readings.append(_valid(year, DAY_MONTHS[token[:4]]))
+    if token[:4] in MONTH_DAYS:
+        readings.append(_valid(year, MONTH_DAYS[token[:4]]))
+    return _nearest(readings)
+
+def _read_4(token):
+    # A recent year, or a bare DDMM / MMDD
+    if token[:2] in ("19", "20"):
+        return YEARS[token], None, None
+    month_day = DAY_MONTHS.get(token) or MONTH_DAYS.get(token)
+    if month_day is not None:
+        return None, month_day[0], month_day[1]
+    return None
+
+_READERS = ((8, _read_8), (6, _read_6), (4, _read_4))
+
+def _read_separated(first, second, third):
+    """Read separated fields as Y-M-D, D-M-Y or M-D-Y"""
+    readings = []
+    if len(first) == 4:
+        if first in YEARS:
+            month_day = MONTH_DAYS.get(second.zfill(2) + third.zfill(2)) if len(third) <= 2 else None
+            if month_day is not None:
+                readings.append(_valid(YEARS[first], month_day))
+        return _nearest(readings)
+    if len(first) > 2:
+        return None
+    year = YEARS.get(third)
+    if year is None:
+        return None
+    pair = first.zfill(2) + second.zfill(2)
+    if pair in DAY_MONTHS:
+        readings.append(_valid(year, DAY_MONTHS[pair]))
+    if pair in MONTH_DAYS:
+        readings.append(_valid(year, MONTH_DAYS[pair]))
+    return _nearest(readings)
+
+def find_dates(password):
+    """Return every year and date in a password as pattern_matching-style matches, by position"""
+    found = []
+    for run in DIGIT_RUN.finditer(password):
+        digits = run.group()
+        offset = run.start()
+        # Longest reading first at each position; anything inside an earlier, longer date is skipped
+        covered = 0
+        for i in range(len(digits) - 3):
+            for length, read in _READERS:
+                end = i + length
+                if end > len(digits) or end <= covered:
+                    continue
+                reading = read(digits[i:end])
+                if reading is not None:
+                    year, month, day = reading
+                    found.append({
+                        "pattern": "date", "i": offset + i, "j": offset + end - 1, "token": digits[i:end],
+                        "separator": "", "year": year, "month": month, "day": day,
+                    })
+                    covered = end
+                    break
+
+    for separated in SEPARATED_DATE.finditer(password):
+        reading = _read_separated(separated.group(1), separated.group(3), separated.group(4))
+        if reading is not None:
+            year, month, day = reading
+            found.append({
+                "pattern": "date", "i": separated.start(), "j": separated.end() - 1,
+                "token": separated.group(), "separator": separated.group(2),
+                "year": year, "month": month, "day": day,
+            })
+    found.sort(key=lambda m: (m["i"], m["j"]))
+    return found
+
+def has_date(password):
+    """True if a password contains a year or a date"""
+    return bool(find_dates(password))
+
+def estimate_guesses(match):
+    """Guesses to hit a date match: the plausible years, times the days of the year, times separators"""
+    if match["year"] is None:
+        guesses = DAYS_IN_YEAR
+    else:
+        guesses = max(abs(match["year"] - REFERENCE_YEAR), MIN_YEAR_SPACE)
+        if match["month"] is not None:
+            guesses *= DAYS_IN_YEAR
+    if match["separator"]:
+        guesses *= 4
+    return guesses
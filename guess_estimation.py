@@ -0,0 +1,276 @@
+"""
+Password Strength Checker - Guess Estimation
+Prices every pattern match as a number of guesses and finds, by dynamic
+programming over password positions, the sequence of non-overlapping
+matches (with brute force filling the gaps) an attacker would need the
+fewest guesses to hit. This is the minimum-guess search from zxcvbn.
+
+The search keeps, for every end position k and sequence length l, only the
+cheapest sequence, so its cost grows with the number of matches rather than
+with the number of possible decompositions.
+"""
+
+import math
+import re
+import sys
+
+import crack_time
+import date_patterns
+import keyboard_graphs
+import pattern_matching
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+
+# Longer passwords are priced in chunks of this length, keeping the
+# matchers' per-password cost bounded
+MAX_ANALYZED_LENGTH = 64
+# Only this many leading characters are priced at all; anything past it can
+# only add guesses, so the estimate stays a lower bound
+MAX_ESTIMATED_LENGTH = 256
+
+# In long passwords, runs of a repeated block at least this long are priced
+# as one repeat before chunking, so a chunk boundary never splits them
+MIN_COLLAPSED_REPEAT = 16
+MAX_REPEAT_BLOCK = 32
+BLOCK_REPEAT = re.compile(r'(.{1,%d})\1+' % MAX_REPEAT_BLOCK, re.DOTALL)
+
+START_UPPER = re.compile(r'^[A-Z][^A-Z]+$')
+END_UPPER = re.compile(r'^[^A-Z]+[A-Z]$')
+ALL_UPPER = re.compile(r'^[^a-z]+$')
+
+def n_choose_k(n, k):
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+def bruteforce_guesses(match):
+    guesses = BRUTEFORCE_CARDINALITY ** len(match["token"])
+    # Brute-forced submatches must not undercut the smallest real pattern
+    min_guesses = MIN_SUBMATCH_GUESSES_SINGLE_CHAR + 1 if len(match["token"]) == 1 \
+        else MIN_SUBMATCH_GUESSES_MULTI_CHAR + 1
+    return max(guesses, min_guesses)
+
+def uppercase_variations(token):
+    """Ways an attacker would try capitalising a dictionary word"""
+    if token.lower() == token:
+        return 1
+    # Capitalised first or last letter, or all caps: common enough to cost only a doubling
+    for pattern in (START_UPPER, END_UPPER, ALL_UPPER):
+        if pattern.match(token):
+            return 2
+    upper = sum(1 for ch in token if ch.isupper())
+    lower = sum(1 for ch in token if ch.islower())
+    return sum(n_choose_k(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+def dictionary_guesses(match):
+    guesses = match["rank"] * uppercase_variations(match["token"])
+    if match["l33t"]:
+        # Each substituted symbol is an extra choice the attacker has to try
+        guesses *= 2 ** match["sub_count"]
+    if match["reversed"]:
+        guesses *= 2
+    return guesses
+
+def spatial_guesses(match):
+    layout = keyboard_graphs.LAYOUTS[match["graph"]]
+    starts, degree = layout.starting_positions, layout.average_degree
+    length = len(match["token"])
+    turns = match["turns"]
+    guesses = 0
+    # Every walk up to this length with at most this many turns
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += n_choose_k(i - 1, j - 1) * starts * degree ** j
+
+    shifted = match["shifted_count"]
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(n_choose_k(length, i) for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+def repeat_guesses(match):
+    return match["base_guesses"] * match["repeat_count"]
+
+def sequence_guesses(match):
+    token = match["token"]
+    # Sequences starting at an obvious place are tried first
+    if token[0] in "aAzZ019":
+        base = 4
+    elif token[0].isdigit():
+        base = 10
+    else:
+        base = 26
+    if not match["ascending"]:
+        base *= 2
+    return base * len(token)
+
+ESTIMATORS = {
+    "bruteforce": bruteforce_guesses,
+    "dictionary": dictionary_guesses,
+    "spatial": spatial_guesses,
+    "repeat": repeat_guesses,
+    "sequence": sequence_guesses,
+    "date": date_patterns.estimate_guesses,
+}
+
+def estimate_guesses(match, password):
+    """Guesses needed for a match, cached on the match"""
+    if "guesses" in match:
+        return match["guesses"]
+    min_guesses = 1
+    if len(match["token"]) < len(password):
+        min_guesses = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match["token"]) == 1 \
+            else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+    guesses = max(ESTIMATORS[match["pattern"]](match), min_guesses)
+    match["guesses"] = guesses
+    match["guesses_log10"] = math.log10(guesses)
+    return guesses
+
+def most_guessable_match_sequence(password, matches):
+    """Find the cheapest non-overlapping cover of the password by matches and brute force
+
+    Returns a dict with the total guesses, their log10 and the match sequence.
+    """
+    n = len(password)
+    matches_by_end = [[] for _ in range(n)]
+    for match in matches:
+        matches_by_end[match["j"]].append(match)
+    for ending in matches_by_end:
+        ending.sort(key=lambda m: m["i"])
+
+    # For each end position k and sequence length l: the last match, the
+    # product of guesses so far, and the total guesses including ordering
+    best_match = [{} for _ in range(n)]
+    best_product = [{} for _ in range(n)]
+    best_total = [{} for _ in range(n)]
+
+    def update(match, length):
+        k = match["j"]
+        product = estimate_guesses(match, password)
+        if length > 1:
+            product *= best_product[match["i"] - 1][length - 1]
+        # The attacker also has to guess the order and number of patterns
+        total = math.factorial(length) * product + MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (length - 1)
+        # A longer sequence is only kept if it beats every shorter one
+        for other_length, other_total in best_total[k].items():
+            if other_length <= length and other_total <= total:
+                return
+        best_total[k][length] = total
+        best_match[k][length] = match
+        best_product[k][length] = product
+
+    def bruteforce(i, j):
+        return {"pattern": "bruteforce", "i": i, "j": j, "token": password[i:j + 1]}
+
+    def bruteforce_update(k):
+        update(bruteforce(0, k), 1)
+        for i in range(1, k + 1):
+            match = bruteforce(i, k)
+            for length, last in list(best_match[i - 1].items()):
+                # Two brute-force runs in a row are always worse than one
+                if last["pattern"] != "bruteforce":
+                    update(match, length + 1)
+
+    for k in range(n):
+        for match in matches_by_end[k]:
+            if match["i"] > 0:
+                for length in list(best_match[match["i"] - 1]):
+                    update(match, length + 1)
+            else:
+                update(match, 1)
+        bruteforce_update(k)
+
+    if n == 0:
+        return {"password": password, "guesses": 1, "guesses_log10": 0.0, "sequence": []}
+
+    # Unwind from the cheapest sequence ending at the last character
+    length = min(best_total[n - 1], key=best_total[n - 1].get)
+    guesses = best_total[n - 1][length]
+    sequence = []
+    k = n - 1
+    while k >= 0:
+        match = best_match[k][length]
+        sequence.insert(0, match)
+        k = match["i"] - 1
+        length -= 1
+    return {"password": password, "guesses": guesses, "guesses_log10": math.log10(guesses),
+            "sequence": sequence}
+
+def _repeat_runs(password):
+    """Yield (start, end, block) of long runs of a repeated block, using its shortest period"""
+    position = 0
+    while True:
+        found = BLOCK_REPEAT.search(password, position)
+        if found is None:
+            return
+        start = found.start()
+        block = found.group(1)
+        # "abab" repeated is a repeat of "ab"
+        block = block[:(block + block).find(block, 1)]
+        period = len(block)
+        # Whole blocks only, extended past what the bounded regex saw
+        end = found.end()
+        while password.startswith(block, end):
+            end += period
+        end = start + (end - start) // period * period
+        if end - start >= MIN_COLLAPSED_REPEAT:
+            yield start, end, block
+        position = end
+
+def _chunk_sequence(text, offset):
+    """Price text in chunks of MAX_ANALYZED_LENGTH, returning (guesses_log10, sequence)"""
+    guesses_log10 = 0.0
+    sequence = []
+    for start in range(0, len(text), MAX_ANALYZED_LENGTH):
+        chunk = text[start:start + MAX_ANALYZED_LENGTH]
+        result = most_guessable_match_sequence(chunk, pattern_matching.omnimatch(chunk))
+        guesses_log10 += result["guesses_log10"]
+        for match in result["sequence"]:
+            match["i"] += offset + start
+            match["j"] += offset + start
+        sequence.extend(result["sequence"])
+    return guesses_log10, sequence
+
+def estimate_password_guesses(password):
+    """Estimate how many guesses an attacker needs for a password
+
+    Returns a dict with guesses, guesses_log10, the match sequence that
+    explains them and crack_times ({attacker: (seconds, display)}). Only the
+    first MAX_ESTIMATED_LENGTH characters are priced.
+    """
+    if len(password) <= MAX_ANALYZED_LENGTH:
+        result = most_guessable_match_sequence(password, pattern_matching.omnimatch(password))
+        result["crack_times"] = crack_time.estimate_crack_times(result["guesses_log10"])
+        return result
+
+    # Long repeats are priced as a whole, the text between them chunk by chunk;
+    # the parts are guessed independently, so their guesses multiply and are
+    # summed as logarithms, since the product can outgrow a float
+    priced = password[:MAX_ESTIMATED_LENGTH]
+    guesses_log10 = 0.0
+    sequence = []
+    position = 0
+    for start, end, block in _repeat_runs(priced):
+        gap_log10, gap_sequence = _chunk_sequence(priced[position:start], position)
+        base = most_guessable_match_sequence(block, pattern_matching.omnimatch(block))
+        match = {
+            "pattern": "repeat", "i": start, "j": end - 1, "token": priced[start:end],
+            "base_token": block, "base_guesses": base["guesses"], "base_matches": base["sequence"],
+            "repeat_count": (end - start) // len(block),
+        }
+        estimate_guesses(match, priced)
+        guesses_log10 += gap_log10 + match["guesses_log10"]
+        sequence.extend(gap_sequence)
+        sequence.append(match)
+        position = end
+    gap_log10, gap_sequence = _chunk_sequence(priced[position:], position)
+    guesses_log10 += gap_log10
+    sequence.extend(gap_sequence)
+
+    guesses = 10 ** guesses_log10 if guesses_log10 < sys.float_info.max_10_exp else math.inf
+    return {"password": password, "guesses": guesses, "guesses_log10": guesses_log10,
+            "sequence": sequence, "crack_times": crack_time.estimate_crack_times(guesses_log10)}
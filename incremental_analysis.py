@@ -0,0 +1,165 @@
+"""
+Password Strength Checker - Incremental Analysis
+Per-keystroke analysis for the web app, which reruns on every change of the
+password box.
+
+The analyzer keeps one small state per prefix of the password: running
+character class counts, the current repeat run, the open sequence run, the
+open walk on each keyboard layout and the embedded-password automaton state.
+Typing or deleting at the end therefore costs one state step, and an edit in
+the middle only replays the characters after it. Only the whole-password
+lookups (common password rank, look-alikes, breach corpus) and the date scan
+run per result.
+"""
+
+import os
+
+import analyzer
+import keyboard_graphs
+import wordlist
+
+# Python lower-cases a final sigma differently in context ("ΑΣ" -> "ας"),
+# so passwords containing it are analyzed in full
+CONTEXT_LOWERED = "Σ"
+
+# Class count slots (lower, upper, digit, symbol, special) each class increments;
+# ASCII symbols are also special, and other scripts count towards the same classes
+_CLASS_SLOTS = {analyzer.LOWER: (0,), analyzer.UPPER: (1,), analyzer.DIGIT: (2,),
+                analyzer.SYMBOL: (3, 4), analyzer.INTL_LOWER: (0,), analyzer.UNCASED: (0,),
+                analyzer.INTL_UPPER: (1,), analyzer.INTL_DIGIT: (2,), analyzer.SPECIAL: (4,),
+                analyzer.OTHER: ()}
+_COUNT_SLOTS = {chr(code): _CLASS_SLOTS[analyzer.CLASS_TABLE[code]] for code in range(128)}
+
+def _count_slots(char):
+    slots = _COUNT_SLOTS.get(char)
+    if slots is None:
+        slots = _CLASS_SLOTS[analyzer.char_class(char)]
+    return slots
+
+_LAYOUTS = list(keyboard_graphs.LAYOUTS.values())
+
+class _PrefixState:
+    """Everything the pattern checks need to know about one prefix of the password"""
+    __slots__ = ("counts", "last_char", "run", "repeated",
+                 "seq_run", "sequence",
+                 "walks", "keyboard", "node", "embedded")
+
+    def __init__(self):
+        self.counts = (0, 0, 0, 0, 0)
+        self.last_char = None
+        self.run = 0
+        self.repeated = False
+        self.seq_run = analyzer.NO_SEQUENCE
+        self.sequence = False
+        # Per layout: (last key, heading, turns, length of the open walk)
+        self.walks = tuple((None, 0, 0, 0) for _ in _LAYOUTS)
+        self.keyboard = False
+        self.node = 0
+        self.embedded = False
+
+    def step(self, char, matcher):
+        """Return the state of this prefix extended by one character"""
+        state = _PrefixState.__new__(_PrefixState)
+
+        slots = _count_slots(char)
+        if slots:
+            counts = list(self.counts)
+            for slot in slots:
+                counts[slot] += 1
+            state.counts = tuple(counts)
+        else:
+            state.counts = self.counts
+
+        # Repeats are case-sensitive, like REPEAT_RUN
+        state.last_char = char
+        state.run = self.run + 1 if char == self.last_char else 1
+        state.repeated = self.repeated or state.run >= 3
+
+        # Sequences and keyboard walks work on the lower-cased text
+        seq_run, sequence = self.seq_run, self.sequence
+        walks, keyboard = list(self.walks), self.keyboard
+        lowered = char.lower()
+        for ch in lowered:
+            seq_run = analyzer.extend_sequence(seq_run, analyzer.SEQUENCE_CODES.get(ch))
+            sequence = sequence or seq_run[2] >= analyzer.MIN_SEQUENCE_LENGTH
+
+            for i, layout in enumerate(_LAYOUTS):
+                key, heading, turns, length = walks[i]
+                current = layout.key(ch)
+                direction = layout.direction(key, current)
+                if direction:
+                    if direction != heading:
+                        turns += 1
+                        heading = direction
+                    length += 1
+                else:
+                    # The open walk has ended; only now is its final shape known
+                    keyboard = keyboard or analyzer.is_keyboard_pattern(length, turns)
+                    heading, turns, length = 0, 0, 1
+                walks[i] = (current, heading, turns, length)
+        state.seq_run, state.sequence = seq_run, sequence
+        state.walks, state.keyboard = tuple(walks), keyboard
+
+        if matcher is not None:
+            state.node, hit = matcher.advance(self.node, lowered.encode("utf-8", "surrogatepass"))
+            state.embedded = self.embedded or hit
+        else:
+            state.node, state.embedded = 0, False
+        return state
+
+    def has_keyboard_pattern(self):
+        return self.keyboard or any(analyzer.is_keyboard_pattern(length, turns)
+                                    for _, _, turns, length in self.walks)
+
+class IncrementalAnalyzer:
+    """Password analysis updated keystroke by keystroke, with the same results as analyze_password_strength"""
+
+    def __init__(self):
+        self._text = ""
+        self._matcher = wordlist.get_available_substring_matcher()
+        self._states = [_PrefixState()]
+
+    @property
+    def text(self):
+        return self._text
+
+    def update(self, password):
+        """Move to a new password, reusing the state of the prefix it shares with the old one"""
+        matcher = wordlist.get_available_substring_matcher()
+        if matcher is not self._matcher:
+            # The automaton was built or reloaded, so every automaton state is stale
+            self._matcher = matcher
+            del self._states[1:]
+            self._text = ""
+        keep = len(os.path.commonprefix([self._text, password]))
+        del self._states[keep + 1:]
+        states = self._states
+        for char in password[keep:]:
+            states.append(states[-1].step(char, matcher))
+        self._text = password
+
+    def result(self):
+        """Return the AnalysisResult for the current password"""
+        if wordlist.get_available_substring_matcher() is not self._matcher:
+            self.update(self._text)
+        password = self._text
+        if not password or CONTEXT_LOWERED in password:
+            return analyzer.analyze_password_strength(password)
+
+        state = self._states[-1]
+        profile = analyzer.PasswordProfile.from_counts(password.lower(), *state.counts)
+        pattern_mask = 0
+        if state.repeated:
+            pattern_mask |= analyzer.REPEATING
+        if state.sequence:
+            pattern_mask |= analyzer.SEQUENCE
+        if state.has_keyboard_pattern():
+            pattern_mask |= analyzer.KEYBOARD
+        # Dates are a linear scan of the digit runs, cheap enough to redo per result
+        pattern_mask |= analyzer.date_issue_mask(password)
+        return analyzer.score_password(password, profile, pattern_mask, state.embedded)
+
+    def analyze(self, password):
+        """Update to a new password and return its analysis"""
+        self.update(password)
+        return self.result()
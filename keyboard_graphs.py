@@ -0,0 +1,198 @@
+"""
+Password Strength Checker - Keyboard Adjacency Graphs
+Adjacency graphs for spatial pattern detection ("qwer", "zaq1", "!@#$"),
+built once at import from plain-text drawings of each keyboard layout.
+
+Each layout is packed into compact tables: a dict from character to key id
+(with the shift state in the low bit) and a key_count x key_count byte table
+holding the direction from one key to the other (0 if not adjacent). A walk
+detector then needs a single lookup per character to follow runs of adjacent
+keys, count direction changes and shifted keys.
+"""
+
+import re
+
+from byte_steps import byte_steps
+
+# Grid position (x, y) is coded as a byte GRID_ORIGIN + GRID_ROW * y + x, so adjacent keys differ by one of these
+GRID_ROW = 16
+GRID_ORIGIN = 16
+ADJACENT_STEPS = frozenset(dx + GRID_ROW * dy for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+
+QWERTY = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+"""
+
+# French layout: digits are on the shift layer
+AZERTY = r"""
+   &1 é2 "3 '4 (5 -6 è7 _8 ç9 à0 )° =+
+    aA zZ eE rR tT yY uU iI oO pP ^¨ $£
+     qQ sS dD fF gG hH jJ kK lL mM ù% *µ
+      wW xX cC vV bB nN ,? ;. :/ !§
+"""
+
+# German layout
+QWERTZ = r"""
+^° 1! 2" 3§ 4$ 5% 6& 7/ 8( 9) 0= ß? ´`
+    qQ wW eE rR tT zZ uU iI oO pP üÜ +*
+     aA sS dD fF gG hH jJ kK lL öÖ äÄ #'
+      yY xX cC vV bB nN mM ,; .: -_
+"""
+
+DVORAK = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) [{ ]}
+    '" ,< .> pP yY fF gG cC rR lL /? =+ \|
+     aA oO eE uU iI dD hH tT nN sS -_
+      ;: qQ jJ kK xX bB mM wW vV zZ
+"""
+
+KEYPAD = r"""
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+  0 .
+"""
+
+def _slanted_neighbours(x, y):
+    """Neighbours on a row-staggered keyboard: left, upper-left, upper-right, right, lower-right, lower-left"""
+    return [(x - 1, y), (x, y - 1), (x + 1, y - 1), (x + 1, y), (x, y + 1), (x - 1, y + 1)]
+
+def _aligned_neighbours(x, y):
+    """Neighbours on a grid keypad, clockwise from the left"""
+    return [(x - 1, y), (x - 1, y - 1), (x, y - 1), (x + 1, y - 1),
+            (x + 1, y), (x + 1, y + 1), (x, y + 1), (x - 1, y + 1)]
+
+def _key_positions(drawing, slanted):
+    """Map (x, y) grid positions to the key drawn there"""
+    positions = {}
+    x_unit = len(drawing.split()[0]) + 1
+    for y, line in enumerate(drawing.split("\n")):
+        # Each row of a staggered keyboard starts half a key further right
+        slant = y - 1 if slanted else 0
+        for key in re.finditer(r"\S+", line):
+            positions[((key.start() - slant) // x_unit, y)] = key.group(0)
+    return positions
+
+class KeyboardLayout:
+    """One keyboard layout packed into a character table and a key-to-key direction table"""
+    __slots__ = ("name", "key_count", "starting_positions", "average_degree", "grid_codes", "_key_of", "_direction")
+
+    def __init__(self, name, drawing, slanted):
+        positions = _key_positions(drawing, slanted)
+        key_ids = {xy: k for k, xy in enumerate(sorted(positions, key=lambda xy: (xy[1], xy[0])))}
+        key_count = len(key_ids)
+
+        # Key id in the high bits, 1 in the low bit for the shifted character
+        key_of = {}
+        # ASCII byte -> grid position byte of its key, 0 for bytes not on the layout
+        grid_codes = bytearray(256)
+        for xy, key in positions.items():
+            for shifted, char in enumerate(key):
+                key_of[char] = key_ids[xy] << 1 | shifted
+                if char.isascii():
+                    x, y = xy
+                    grid_codes[ord(char)] = GRID_ORIGIN + GRID_ROW * y + x
+
+        # Direction (1-based) from one key to an adjacent key, 0 otherwise
+        direction = bytearray(key_count * key_count)
+        neighbours = _slanted_neighbours if slanted else _aligned_neighbours
+        edges = 0
+        for xy, a in key_ids.items():
+            for d, coord in enumerate(neighbours(*xy)):
+                b = key_ids.get(coord)
+                if b is not None:
+                    direction[a * key_count + b] = d + 1
+                    edges += 1
+
+        self.name = name
+        self.key_count = key_count
+        self.starting_positions = len(key_of)
+        self.average_degree = edges / key_count
+        self.grid_codes = bytes(grid_codes)
+        self._key_of = key_of
+        self._direction = bytes(direction)
+
+    def key(self, char):
+        """Key id of a character (shift state in the low bit), or None if the layout lacks it"""
+        return self._key_of.get(char)
+
+    def direction(self, a, b):
+        """Direction (1-based) from key id a to key id b, or 0 if they don't touch"""
+        if a is None or b is None:
+            return 0
+        return self._direction[(a >> 1) * self.key_count + (b >> 1)]
+
+    def walks(self, text, min_length=3):
+        """Return (start, length, turns, shifted_count) of every run of adjacent keys in one pass"""
+        key_of = self._key_of
+        direction_table = self._direction
+        key_count = self.key_count
+        found = []
+        n = len(text)
+        if n < min_length:
+            return found
+
+        previous = key_of.get(text[0])
+        start = 0
+        turns = 0
+        heading = 0
+        shifted = previous & 1 if previous is not None else 0
+        for i in range(1, n):
+            current = key_of.get(text[i])
+            step = 0
+            if previous is not None and current is not None:
+                step = direction_table[(previous >> 1) * key_count + (current >> 1)]
+            if step:
+                if step != heading:
+                    turns += 1
+                    heading = step
+                shifted += current & 1
+            else:
+                if i - start >= min_length:
+                    found.append((start, i - start, turns, shifted))
+                start, turns, heading = i, 0, 0
+                shifted = current & 1 if current is not None else 0
+            previous = current
+        if n - start >= min_length:
+            found.append((start, n - start, turns, shifted))
+        return found
+
+# Step byte (0x80 plus the difference of two grid codes) -> 1 if the keys may be adjacent
+_ADJACENT_BYTES = bytes(1 if step - 0x80 in ADJACENT_STEPS else 0 for step in range(256))
+
+LAYOUTS = {
+    "qwerty": KeyboardLayout("qwerty", QWERTY, slanted=True),
+    "azerty": KeyboardLayout("azerty", AZERTY, slanted=True),
+    "qwertz": KeyboardLayout("qwertz", QWERTZ, slanted=True),
+    "dvorak": KeyboardLayout("dvorak", DVORAK, slanted=True),
+    "keypad": KeyboardLayout("keypad", KEYPAD, slanted=False),
+}
+
+_LAYOUT_ITEMS = list(LAYOUTS.items())
+_GRID_TABLES = [layout.grid_codes for layout in LAYOUTS.values()]
+
+def _candidate_layouts(text, min_length):
+    """The (name, layout) pairs on which text may hold a walk of min_length keys"""
+    if len(text) < min_length:
+        return []
+    if not text.isascii() or min_length < 2:
+        # Keys outside ASCII ("é" on AZERTY) have no grid code, so every layout is walked
+        return _LAYOUT_ITEMS
+    data = text.encode()
+    n = len(data)
+    # One segment per layout, separated by a 0 byte, which no grid code is adjacent to
+    joined = b"\0".join([data.translate(table) for table in _GRID_TABLES])
+    adjacent = byte_steps(joined).translate(_ADJACENT_BYTES).decode("latin-1")
+    run = "\1" * (min_length - 1)
+    if run not in adjacent:
+        return []
+    return [item for k, item in enumerate(_LAYOUT_ITEMS) if run in adjacent[k * (n + 1):k * (n + 1) + n]]
+
+def find_walks(text, min_length=3):
+    """Return (layout name, start, length, turns, shifted_count) of keyboard walks on every layout"""
+    return [(name,) + walk for name, layout in _candidate_layouts(text, min_length)
+            for walk in layout.walks(text, min_length)]
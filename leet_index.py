@@ -0,0 +1,87 @@
+"""
+Password Strength Checker - Leetspeak Index
+Catches look-alike variants of common passwords ("P@ssw0rd", "m0nk3y").
+
+Every common password containing letters is reduced to a canonical form in
+which each group of look-alike characters collapses to a single letter, and
+the canonical forms are indexed once at load time. Each group holds at most
+one digit, entries without letters are left to the exact lookup and plain
+numbers are never variants, so a match always puts a symbol or digit where a
+common password has a letter. Checking a password then costs one probe per
+variant, with a small bounded set of multi-character substitutions ("ph" for
+"f", "|<" for "k") expanded on top, instead of brute-forcing substitutions
+against the list.
+"""
+
+from array import array
+from bisect import bisect_left
+
+# Each group of look-alike characters collapses to its first member; no two digits share a group
+LEET_GROUPS = ["a@4", "b8", "e3", "g9", "il1!|", "o0", "s$5", "t7+", "z2"]
+CANONICAL_TABLE = str.maketrans({ch: group[0] for group in LEET_GROUPS for ch in group[1:]})
+
+# Passwords without any of these are plain text and are left to the exact lookup
+LEET_SYMBOLS = frozenset(ch for group in LEET_GROUPS for ch in group[1:] if not ch.isalpha())
+
+# Multi-character look-alikes, expanded on top of the canonical form
+MULTI_CHAR_SUBSTITUTIONS = [
+    ("|-|", "h"), ("|\\/|", "m"), ("|\\|", "n"), ("/\\", "a"), ("()", "o"),
+    ("|<", "k"), ("|)", "d"), ("vv", "w"), ("ph", "f"),
+]
+MAX_PROBES = 8
+
+def canonical_form(password):
+    """Collapse look-alike characters of a lower-cased password"""
+    return password.translate(CANONICAL_TABLE)
+
+def expand_variants(password, max_probes=MAX_PROBES):
+    """Return up to max_probes spellings of a password with multi-character substitutions applied"""
+    variants = [password]
+    for old, new in MULTI_CHAR_SUBSTITUTIONS:
+        if len(variants) >= max_probes:
+            break
+        if old in password:
+            variants.extend(v.replace(old, new) for v in variants[:max_probes - len(variants)] if old in v)
+    return variants
+
+def _has_letter(password):
+    return any(ch.isalpha() for ch in password)
+
+class LeetIndex:
+    """Sorted array of canonical-form hashes with the best rank for each"""
+
+    def __init__(self, ranked_items):
+        # hash() is randomised per process, which is fine for an index rebuilt at load time
+        best = {}
+        for pwd, rank in ranked_items:
+            # Numeric and symbol-only entries have no letters to stand in for
+            if not _has_letter(pwd):
+                continue
+            key = hash(canonical_form(pwd))
+            if rank < best.get(key, rank + 1):
+                best[key] = rank
+        keys = sorted(best)
+        self._keys = array("q", keys)
+        self._ranks = array("I", (best[key] for key in keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _probe(self, canonical):
+        key = hash(canonical)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._ranks[i]
+        return None
+
+    def rank(self, password):
+        """Return the best rank of a common password this (lower-cased) password is a leet variant of"""
+        # Plain text and plain numbers are left to the exact lookup
+        if not any(ch in LEET_SYMBOLS for ch in password) or password.isdigit():
+            return None
+        best = None
+        for variant in expand_variants(password):
+            rank = self._probe(canonical_form(variant))
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return best
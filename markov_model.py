@@ -0,0 +1,160 @@
+"""
+Password Strength Checker - Character Markov Model
+A smoothed character n-gram model trained on list.txt that scores how much
+a password looks like the passwords people actually choose, as the number
+of bits an attacker's model-guided guessing needs (-log2 of its probability).
+
+Training counts every n-gram of the (lower-cased) common passwords, padded
+with a boundary symbol, and smooths each order towards the one below it.
+The result is a single table of costs, one uint16 (1/1024 bit) per n-gram,
+written to a compiled file that is memory-mapped on load. Scoring is one
+table lookup per character.
+
+Build it with:
+    python markov_model.py [order]
+"""
+
+import math
+import os
+import string
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+import artifact_file
+import wordlist
+
+# Default location of the compiled model, next to list.txt
+MODEL_PATH = os.path.splitext(wordlist.WORDLIST_PATH)[0] + ".markov"
+DEFAULT_ORDER = 3
+
+# Weight of the lower-order estimate when smoothing each order
+SMOOTHING = 5.0
+COST_SCALE = 1024
+MAX_COST = 0xFFFF
+
+MAGIC = b"PSCMARKV"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIQQ")
+
+# Symbol 0 pads the start and marks the end, 1 stands for any other character.
+# Letters are folded to lower case, matching the lower-cased training list.
+BOUNDARY, OTHER = 0, 1
+_PRINTABLE = [ch for ch in string.printable[:95] if not ch.isupper()]
+SYMBOLS = {ch: i + 2 for i, ch in enumerate(_PRINTABLE)}
+SYMBOLS.update({ch.upper(): SYMBOLS[ch] for ch in string.ascii_lowercase})
+ALPHABET_SIZE = len(_PRINTABLE) + 2
+
+# Code point -> symbol for the vectorized scorer (everything non-ASCII is OTHER)
+_ASCII_SYMBOLS = np.full(128, OTHER, dtype=np.int64)
+for _ch, _symbol in SYMBOLS.items():
+    _ASCII_SYMBOLS[ord(_ch)] = _symbol
+
+def _ngram_indices(entries, order):
+    """Table index of every n-gram in the boundary-padded entries"""
+    size = ALPHABET_SIZE
+    context_size = size ** (order - 1)
+    indices = array("q")
+    for entry in entries:
+        context = 0
+        for ch in entry:
+            index = context * size + SYMBOLS.get(ch, OTHER)
+            indices.append(index)
+            context = index % context_size
+        indices.append(context * size + BOUNDARY)
+    return np.frombuffer(indices, dtype=np.int64)
+
+def train_costs(entries, order=DEFAULT_ORDER, smoothing=SMOOTHING):
+    """Count n-grams and return the smoothed cost table (uint16, 1/1024 bits)"""
+    size = ALPHABET_SIZE
+    counts = np.bincount(_ngram_indices(entries, order), minlength=size ** order).astype(np.float64)
+    counts = counts.reshape((size,) * order)
+
+    # Unigrams get add-one smoothing; each higher order is pulled towards the one below
+    unigrams = counts.sum(axis=tuple(range(order - 1)))
+    probs = (unigrams + 1) / (unigrams.sum() + size)
+    for n in range(2, order + 1):
+        ngrams = counts.sum(axis=tuple(range(order - n))) if n < order else counts
+        totals = ngrams.sum(axis=-1, keepdims=True)
+        probs = (ngrams + smoothing * probs) / (totals + smoothing)
+
+    costs = np.rint(-np.log2(probs) * COST_SCALE)
+    return np.minimum(costs, MAX_COST).astype(np.uint16).reshape(-1)
+
+def build_model(source=wordlist.WORDLIST_PATH, dest=MODEL_PATH, order=DEFAULT_ORDER):
+    """Train the model on a wordlist text file and write the compiled table, returning the model"""
+    if order < 1:
+        raise ValueError("Model order must be at least 1")
+    entries = list(wordlist.read_password_ranks(source))
+    costs = train_costs(entries, order)
+
+    source_size, source_mtime = wordlist.source_stamp(source)
+    header = HEADER.pack(MAGIC, VERSION, order, ALPHABET_SIZE, source_size, source_mtime)
+    artifact_file.write_file(dest, header, artifact_file.to_little_endian(array("H", costs.tobytes())))
+    return MarkovModel(array("H", costs.tobytes()), order)
+
+class MarkovModel:
+    """n-gram cost table scored one lookup per character"""
+
+    def __init__(self, costs, order):
+        self.order = order
+        self._costs = costs
+        self._context_size = ALPHABET_SIZE ** (order - 1)
+        self._array = np.frombuffer(costs, dtype=np.uint16)
+
+    def bits(self, password):
+        """Return -log2 of the model probability of a password (higher is less predictable)"""
+        costs = self._costs
+        size = ALPHABET_SIZE
+        context_size = self._context_size
+        symbols = SYMBOLS
+        context = 0
+        total = 0
+        for ch in password:
+            index = context * size + symbols.get(ch, OTHER)
+            total += costs[index]
+            context = index % context_size
+        total += costs[context * size + BOUNDARY]
+        return total / COST_SCALE
+
+    def guesses_log10(self, password):
+        """Rough log10 of the guesses a model-guided attacker needs"""
+        return self.bits(password) * math.log10(2)
+
+    def bits_packed(self, codes, lengths):
+        """Vectorized bits() for an (n, width) code point array and per-row lengths"""
+        n, width = codes.shape
+        size = ALPHABET_SIZE
+        symbols = np.where(codes < 128, _ASCII_SYMBOLS[np.minimum(codes, 127)], OTHER)
+        # The end of each password is scored as a boundary symbol, padding after it is ignored
+        symbols = np.concatenate([symbols, np.zeros((n, 1), dtype=np.int64)], axis=1)
+        positions = np.arange(width + 1)
+        symbols[positions >= lengths[:, None]] = BOUNDARY
+        padded = np.concatenate([np.zeros((n, self.order - 1), dtype=np.int64), symbols], axis=1)
+
+        index = np.zeros((n, width + 1), dtype=np.int64)
+        for k in range(self.order):
+            index = index * size + padded[:, k:k + width + 1]
+        costs = self._array[index].astype(np.int64)
+        costs[positions > lengths[:, None]] = 0
+        return costs.sum(axis=1) / COST_SCALE
+
+def open_current_model(path=MODEL_PATH, source=wordlist.WORDLIST_PATH):
+    """Memory-map the compiled model if it exists and matches list.txt, otherwise return None"""
+    def body_size(fields):
+        _, _, order, alphabet_size, _, _ = fields
+        return 2 * alphabet_size ** order if alphabet_size == ALPHABET_SIZE else None
+
+    opened = artifact_file.open_current(path, HEADER, MAGIC, VERSION, source, stamp_at=4,
+                                        body_size=body_size, native_layout=True)
+    if opened is None:
+        return None
+    mm, (_, _, order, _, _, _) = opened
+    return MarkovModel(memoryview(mm)[HEADER.size:].cast("H"), order)
+
+if __name__ == "__main__":
+    order = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDER
+    model = build_model(order=order)
+    print(f"✅ Built order-{order} Markov model ({2 * ALPHABET_SIZE ** order} bytes)")
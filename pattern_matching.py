@@ -0,0 +1,175 @@
+"""
+Password Strength Checker - Pattern Matching
+zxcvbn-style matchers that enumerate every dictionary, spatial, sequence,
+repeat and date pattern in a password, overlapping or not.
+
+A match is a dict with the pattern name, its inclusive character positions
+i..j, the matched token and pattern-specific details. guess_estimation.py
+prices each match and picks the cheapest way to cover the password.
+"""
+
+import re
+
+import analyzer
+import date_patterns
+import keyboard_graphs
+import wordlist
+from leet_index import LEET_SYMBOLS
+
+# Substrings probed one by one when the compiled matcher is not available
+MAX_DICTIONARY_TOKEN = 24
+# Look-alike spellings are only looked for in tokens of this length range
+MIN_L33T_TOKEN = 3
+MAX_L33T_TOKEN = 16
+
+# Code point steps that still read as a sequence ("aceg", "9630")
+MAX_SEQUENCE_DELTA = 5
+
+GREEDY_REPEAT = re.compile(r'(.+)\1+', re.DOTALL)
+LAZY_REPEAT = re.compile(r'(.+?)\1+', re.DOTALL)
+LAZY_ANCHORED_REPEAT = re.compile(r'^(.+?)\1+$', re.DOTALL)
+
+def _dictionary_spans(lowered):
+    """Yield candidate (i, j) character spans that might be common passwords"""
+    matcher = wordlist.get_available_substring_matcher()
+    n = len(lowered)
+    if matcher is not None:
+        # The automaton covers long entries; shorter ones are probed directly
+        yield from matcher.find_spans(lowered)
+        probe_limit = matcher.min_length - 1
+    else:
+        probe_limit = MAX_DICTIONARY_TOKEN
+    for i in range(n):
+        for j in range(i + 1, min(n, i + probe_limit) + 1):
+            yield i, j
+
+def dictionary_match(password, lowered=None):
+    """Ranked common passwords appearing anywhere in the password"""
+    if lowered is None:
+        lowered = password.lower()
+    common = wordlist.get_available_passwords()
+    matches = []
+    seen = set()
+    for i, j in _dictionary_spans(lowered):
+        if (i, j) in seen:
+            continue
+        seen.add((i, j))
+        rank = common.rank(lowered[i:j])
+        if rank is not None:
+            matches.append({
+                "pattern": "dictionary", "i": i, "j": j - 1, "token": password[i:j],
+                "matched_word": lowered[i:j], "rank": rank, "l33t": False, "reversed": False,
+            })
+    return matches
+
+def reverse_dictionary_match(password, lowered=None):
+    """Common passwords typed backwards ("drowssap")"""
+    if lowered is None:
+        lowered = password.lower()
+    n = len(password)
+    matches = dictionary_match(password[::-1], lowered[::-1])
+    for match in matches:
+        match["token"] = match["token"][::-1]
+        match["reversed"] = True
+        match["i"], match["j"] = n - 1 - match["j"], n - 1 - match["i"]
+    return matches
+
+def l33t_match(password, lowered=None):
+    """Look-alike spellings of common passwords ("p@ssw0rd") anywhere in the password"""
+    if lowered is None:
+        lowered = password.lower()
+    leet = wordlist.get_available_leet_index()
+    if leet is None:
+        return []
+    matches = []
+    n = len(lowered)
+    for i in range(n):
+        for j in range(i + MIN_L33T_TOKEN, min(n, i + MAX_L33T_TOKEN) + 1):
+            token = lowered[i:j]
+            subs = {ch for ch in token if ch in LEET_SYMBOLS}
+            if not subs:
+                continue
+            rank = leet.rank(token)
+            if rank is not None:
+                matches.append({
+                    "pattern": "dictionary", "i": i, "j": j - 1, "token": password[i:j],
+                    "matched_word": token, "rank": rank, "l33t": True, "reversed": False,
+                    "sub_count": len(subs),
+                })
+    return matches
+
+def spatial_match(password):
+    """Keyboard walks of three or more adjacent keys on any known layout"""
+    return [{
+        "pattern": "spatial", "i": start, "j": start + length - 1, "token": password[start:start + length],
+        "graph": name, "turns": turns, "shifted_count": shifted,
+    } for name, start, length, turns, shifted in keyboard_graphs.find_walks(password)]
+
+def sequence_match(password):
+    """Runs with a constant code point step ("abcd", "9753", "zyx")"""
+    matches = []
+    for i, length, step in analyzer.sequence_runs([ord(ch) for ch in password], MAX_SEQUENCE_DELTA):
+        # Two characters only read as a sequence when they are neighbours ("ab")
+        if length < 3 and abs(step) != 1:
+            continue
+        token = password[i:i + length]
+        if token.islower() and token.isalpha():
+            name, space = "lower", 26
+        elif token.isupper() and token.isalpha():
+            name, space = "upper", 26
+        elif token.isdigit():
+            name, space = "digits", 10
+        else:
+            name, space = "unicode", 26
+        matches.append({
+            "pattern": "sequence", "i": i, "j": i + length - 1, "token": token,
+            "sequence_name": name, "sequence_space": space, "ascending": step > 0,
+        })
+    return matches
+
+def repeat_match(password):
+    """Repeated characters or blocks ("aaaa", "abcabcabc")"""
+    # Imported here because pricing a repeat prices its base token recursively
+    import guess_estimation
+
+    matches = []
+    last_index = 0
+    while last_index < len(password):
+        greedy = GREEDY_REPEAT.search(password, last_index)
+        if not greedy:
+            break
+        lazy = LAZY_REPEAT.search(password, last_index)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            # "aabaab": the greedy match finds the repeated block "aab"
+            match = greedy
+            base_token = LAZY_ANCHORED_REPEAT.match(match.group(0)).group(1)
+        else:
+            # "abababab": the lazy match finds the shortest block "ab"
+            match = lazy
+            base_token = match.group(1)
+        i, j = match.span()
+        base = guess_estimation.most_guessable_match_sequence(base_token, omnimatch(base_token))
+        matches.append({
+            "pattern": "repeat", "i": i, "j": j - 1, "token": match.group(0),
+            "base_token": base_token, "base_guesses": base["guesses"],
+            "base_matches": base["sequence"], "repeat_count": len(match.group(0)) // len(base_token),
+        })
+        last_index = j
+    return matches
+
+def date_match(password):
+    """Recent years and dates with or without separators ("1987", "04121987", "4/12/87")"""
+    return date_patterns.find_dates(password)
+
+def omnimatch(password):
+    """Every match found by every matcher, sorted by position"""
+    lowered = password.lower()
+    matches = dictionary_match(password, lowered)
+    matches.extend(reverse_dictionary_match(password, lowered))
+    matches.extend(l33t_match(password, lowered))
+    matches.extend(spatial_match(password))
+    matches.extend(sequence_match(password))
+    matches.extend(repeat_match(password))
+    matches.extend(date_match(password))
+    matches.sort(key=lambda m: (m["i"], m["j"]))
+    return matches
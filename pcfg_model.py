@@ -0,0 +1,172 @@
+"""
+Password Strength Checker - PCFG Structure Model
+A probabilistic context-free grammar learned from list.txt, in the style of
+Weir et al.: a password is a structure of letter (L), digit (D) and symbol
+(S) runs such as L6D2S1 ("monkey12!"), and each run is filled with a
+terminal of that class and length.
+
+Training keeps the structure probabilities and one terminal table per run
+type. Guess numbers are estimated with the Monte Carlo method of Dell'Amico
+and Filippone: passwords are sampled from the grammar once, and their
+probabilities sorted into a cumulative table, so the number of guesses an
+attacker enumerating the grammar in probability order needs before reaching
+a password is a bisect into that table. The table and the estimate are kept
+as logarithms, so arbitrarily unlikely passwords never overflow a float.
+
+Letters are lower-cased; capitalisation is left to the other checks.
+"""
+
+import math
+import random
+import re
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+
+DEFAULT_SAMPLES = 10000
+SAMPLE_SEED = 1729
+LOG10_2 = math.log10(2)
+
+# Alphabet size per class, for terminals never seen in training
+CLASS_ALPHABETS = {"L": 26, "D": 10, "S": 33}
+
+# Letter, digit and symbol runs; the group name is the class
+SEGMENT_RE = re.compile(r"(?P<L>[^\W\d_]+)|(?P<D>\d+)|(?P<S>[\W_]+)")
+
+# ASCII character -> class letter, for classifying whole entries with str.translate
+_ASCII_MASK = str.maketrans({chr(code): SEGMENT_RE.fullmatch(chr(code)).lastgroup for code in range(128)})
+_MASK_RUN_RE = re.compile(r"L+|D+|S+")
+
+def segments(password):
+    """Split a password into (class, run) segments, e.g. [("L", "monkey"), ("D", "12")]"""
+    return [(m.lastgroup, m.group()) for m in SEGMENT_RE.finditer(password)]
+
+def structure_of(parts):
+    return "".join(f"{cls}{len(run)}" for cls, run in parts)
+
+class _Distribution:
+    """Counted items with probabilities, a back-off mass for unseen items and a cumulative table for sampling"""
+
+    def __init__(self, counts):
+        self.total = sum(counts.values())
+        singletons = sum(1 for count in counts.values() if count == 1)
+        # Good-Turing style: the mass of unseen items is the share of items seen once
+        self.unseen = max(singletons, 1) / (self.total + 1)
+        scale = (1 - self.unseen) / self.total if self.total else 0.0
+        self.probabilities = {item: count * scale for item, count in counts.items()}
+        self.items = list(self.probabilities)
+        self.cumulative = list(accumulate(self.probabilities[item] for item in self.items))
+
+    def sample(self, rng):
+        point = rng.random() * self.cumulative[-1]
+        return self.items[min(bisect_right(self.cumulative, point), len(self.items) - 1)]
+
+class PCFGModel:
+    """Structure and terminal probabilities learned from a wordlist, with a guess-number table"""
+
+    def __init__(self, entries, samples=DEFAULT_SAMPLES, seed=SAMPLE_SEED):
+        # Entries with the same class mask ("LLLLLLDDS") share their run boundaries
+        by_mask = {}
+        for entry in entries:
+            by_mask.setdefault(entry.translate(_ASCII_MASK), []).append(entry)
+
+        structures = Counter()
+        runs = Counter()
+        terminals = {}
+        for mask, group in by_mask.items():
+            if not mask.isascii():
+                # Non-ASCII characters are classified one entry at a time
+                for entry in group:
+                    parts = segments(entry)
+                    structures[structure_of(parts)] += 1
+                    for cls, run in parts:
+                        key = f"{cls}{len(run)}"
+                        runs[key] += 1
+                        terminals.setdefault(key, Counter())[run] += 1
+                continue
+            keys = []
+            for m in _MASK_RUN_RE.finditer(mask):
+                start, end = m.span()
+                key = f"{mask[start]}{end - start}"
+                keys.append(key)
+                runs[key] += len(group)
+                terminals.setdefault(key, Counter()).update(entry[start:end] for entry in group)
+            structures["".join(keys)] += len(group)
+
+        self._structures = _Distribution(structures)
+        self._runs = _Distribution(runs)
+        self._terminals = {key: _Distribution(counts) for key, counts in terminals.items()}
+        self._build_guess_table(samples, seed)
+
+    def _build_guess_table(self, samples, seed):
+        """Sample the grammar and tabulate guess numbers by probability"""
+        rng = random.Random(seed)
+        log_probs = []
+        for _ in range(samples):
+            structure = self._structures.sample(rng)
+            log_prob = math.log2(self._structures.probabilities[structure])
+            for key in _structure_keys(structure):
+                terminals = self._terminals[key]
+                log_prob += math.log2(terminals.probabilities[terminals.sample(rng)])
+            log_probs.append(log_prob)
+
+        # Most probable first; each sample stands for 1 / (n * p) passwords at least as likely
+        log_probs.sort(reverse=True)
+        self._sorted_neg_log_probs = [-lp for lp in log_probs]
+        self._log2_cumulative_guesses = [math.log2(guesses) for guesses in
+                                         accumulate(2 ** -lp / samples for lp in log_probs)]
+
+    def log2_probability(self, password):
+        """log2 of the grammar probability of a (lower-cased) password"""
+        parts = segments(password)
+        if not parts:
+            return 0.0
+        structure = structure_of(parts)
+        probability = self._structures.probabilities.get(structure)
+        if probability is not None:
+            log_prob = math.log2(probability)
+        else:
+            # Unseen structure: back off to independent run types
+            log_prob = math.log2(self._structures.unseen)
+            for cls, run in parts:
+                key = f"{cls}{len(run)}"
+                run_probability = self._runs.probabilities.get(key)
+                log_prob += math.log2(run_probability if run_probability else self._runs.unseen)
+
+        for cls, run in parts:
+            terminals = self._terminals.get(f"{cls}{len(run)}")
+            probability = terminals.probabilities.get(run) if terminals else None
+            if probability is not None:
+                log_prob += math.log2(probability)
+            else:
+                # Unseen terminal: the back-off mass spread over every string of this class and length
+                unseen = terminals.unseen if terminals else 1.0
+                log_prob += math.log2(unseen) - len(run) * math.log2(CLASS_ALPHABETS[cls])
+        return log_prob
+
+    def log10_guess_number(self, password):
+        """log10 of the guesses before a probability-ordered attack on the grammar reaches the password"""
+        neg_log_prob = -self.log2_probability(password)
+        # Samples at least as likely as the password come first in the table
+        i = bisect_right(self._sorted_neg_log_probs, neg_log_prob)
+        log2_guesses = self._log2_cumulative_guesses[i - 1] if i else 0.0
+        if i == len(self._sorted_neg_log_probs):
+            # Less likely than every sample: at least the inverse probability
+            log2_guesses = max(log2_guesses, neg_log_prob)
+        return max(log2_guesses, 0.0) * LOG10_2
+
+    def analyze(self, password):
+        """Return (structure, log10 guess number) for a password"""
+        lowered = password.lower()
+        return structure_of(segments(lowered)), self.log10_guess_number(lowered)
+
+def _structure_keys(structure):
+    """Split "L6D2S1" into its run keys ["L6", "D2", "S1"]"""
+    keys = []
+    start = 0
+    for i in range(1, len(structure)):
+        if structure[i] in CLASS_ALPHABETS:
+            keys.append(structure[start:i])
+            start = i
+    keys.append(structure[start:])
+    return keys
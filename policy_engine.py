@@ -0,0 +1,231 @@
+"""
+Password Strength Checker - Organizational Password Policy
+Checks passwords against an organization's own rules instead of the fixed
+scoring thresholds, e.g. "at least 14 characters, no company names, upper
+and lower case, no character three times in a row".
+
+A policy is declared in a TOML (Python 3.11+) or JSON file, either at the top
+level or under a [policy] table:
+
+    min_length = 14
+    max_length = 128
+    required_classes = ["lower", "upper", "digit"]
+    min_classes = 3
+    max_repeat_run = 2
+    banned_terms = ["acme", "rocket"]
+    reject_common = true
+    reject_breached = true
+
+and compiled once into a list of clause checks, cheapest first: banned terms
+become one Aho-Corasick automaton over their look-alike canonical forms (so
+"@cme" is caught as well as "acme"), the repeat limit a compiled regex and
+the class rules a bit mask over one translate() pass. Checking a password
+returns pass/fail with every violated clause.
+
+Set PASSWORD_POLICY_PATH to have the app check passwords against a policy,
+or audit a file of passwords with:
+    python policy_engine.py policy.toml passwords.txt
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+
+import analyzer
+import breach_corpus
+import leet_index
+import substring_matcher
+import wordlist
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+# Policy the app checks against; unset means no organizational policy
+POLICY_PATH = os.environ.get("PASSWORD_POLICY_PATH")
+
+# Character classes a policy can require, as bits of _class_bits()
+CLASS_NAMES = ("lower", "upper", "digit", "special")
+_CLASS_LABELS = {"lower": "lower case letters", "upper": "upper case letters", "digit": "numbers",
+                 "special": "special characters"}
+_CLASS_BITS = {name: 1 << i for i, name in enumerate(CLASS_NAMES)}
+
+CLAUSES = ("min_length", "max_length", "required_classes", "min_classes", "max_repeat_run",
+           "banned_terms", "reject_common", "reject_breached")
+
+_lock = threading.Lock()
+_NOT_LOADED = object()
+_policy = _NOT_LOADED
+_policy_error = None
+
+class PolicyResult:
+    """Pass/fail of one password, with the (clause, message) pairs it violates"""
+    __slots__ = ("passed", "violations")
+
+    def __init__(self, violations):
+        self.violations = tuple(violations)
+        self.passed = not self.violations
+
+    def __bool__(self):
+        return self.passed
+
+    @property
+    def messages(self):
+        return [message for _, message in self.violations]
+
+    def __repr__(self):
+        return f"PolicyResult(passed={self.passed}, violations={[c for c, _ in self.violations]})"
+
+def _class_bits(profile):
+    return ((profile.lower_count > 0) | (profile.upper_count > 0) << 1
+            | (profile.digit_count > 0) << 2 | (profile.special_count > 0) << 3)
+
+class CompiledPolicy:
+    """A policy compiled into clause checks; each check(password, lowered, profile) is True on a violation"""
+
+    def __init__(self, settings, name="policy"):
+        unknown = set(settings) - set(CLAUSES) - {"name"}
+        if unknown:
+            raise ValueError(f"Unknown policy clauses: {', '.join(sorted(unknown))}")
+        self.name = settings.get("name", name)
+        self.settings = dict(settings)
+        self._clauses = []
+
+        min_length = settings.get("min_length")
+        if min_length is not None:
+            self._add("min_length", f"Use at least {min_length} characters",
+                      lambda password, lowered, profile: len(password) < min_length)
+        max_length = settings.get("max_length")
+        if max_length is not None:
+            self._add("max_length", f"Use at most {max_length} characters",
+                      lambda password, lowered, profile: len(password) > max_length)
+
+        required = settings.get("required_classes", [])
+        unknown = set(required) - set(CLASS_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown character classes: {', '.join(sorted(unknown))}")
+        required_bits = 0
+        for name in required:
+            required_bits |= _CLASS_BITS[name]
+        if required_bits:
+            labels = [_CLASS_LABELS[name] for name in CLASS_NAMES if name in required]
+            listed = labels[0] if len(labels) == 1 else f"{', '.join(labels[:-1])} and {labels[-1]}"
+            self._add("required_classes", f"Include {listed}",
+                      lambda password, lowered, profile: _class_bits(profile) & required_bits != required_bits)
+        min_classes = settings.get("min_classes")
+        if min_classes is not None:
+            self._add("min_classes", f"Use at least {min_classes} kinds of characters "
+                                     f"(lower case, upper case, numbers, special)",
+                      lambda password, lowered, profile: bin(_class_bits(profile)).count("1") < min_classes)
+
+        max_repeat_run = settings.get("max_repeat_run")
+        if max_repeat_run is not None:
+            if max_repeat_run < 1:
+                raise ValueError("max_repeat_run must be at least 1")
+            run = re.compile(r"(.)\1{%d}" % max_repeat_run, re.DOTALL)
+            self._add("max_repeat_run", f"Repeat a character at most {max_repeat_run} times in a row",
+                      lambda password, lowered, profile: run.search(password) is not None)
+
+        terms = sorted({leet_index.canonical_form(term.lower()).encode("utf-8", "surrogatepass")
+                        for term in settings.get("banned_terms", []) if term})
+        if terms:
+            automaton = substring_matcher.compile_automaton(terms, set(terms), min_length=1)
+            self._add("banned_terms", "Don't use banned words (company, product or team names)",
+                      lambda password, lowered, profile: any(automaton.iter_matches(
+                          leet_index.canonical_form(lowered).encode("utf-8", "surrogatepass"))))
+
+        if settings.get("reject_common"):
+            self._add("reject_common", "Don't use a common password or a look-alike of one",
+                      _is_common)
+        if settings.get("reject_breached"):
+            self._add("reject_breached", "Don't use a password found in data breaches",
+                      _is_breached)
+
+    def _add(self, clause, message, test):
+        self._clauses.append((clause, message, test))
+
+    @property
+    def clauses(self):
+        return [clause for clause, _, _ in self._clauses]
+
+    def check(self, password, stop_at_first=False):
+        """Check a password, returning a PolicyResult"""
+        lowered = password.lower()
+        profile = analyzer.PasswordProfile(password)
+        violations = []
+        for clause, message, test in self._clauses:
+            if test(password, lowered, profile):
+                violations.append((clause, message))
+                if stop_at_first:
+                    break
+        return PolicyResult(violations)
+
+    def check_many(self, passwords, stop_at_first=False):
+        """Check a sequence of passwords, returning a list of PolicyResults"""
+        if self.settings.get("reject_common"):
+            # Every password is checked against the full list, even while the app is still loading it
+            wordlist.get_common_passwords()
+            wordlist.get_leet_index()
+        check = self.check
+        return [check(password, stop_at_first) for password in passwords]
+
+def _is_common(password, lowered, profile):
+    if wordlist.get_available_passwords().rank(lowered) is not None:
+        return True
+    leet = wordlist.get_available_leet_index()
+    return leet is not None and leet.rank(lowered) is not None
+
+def _is_breached(password, lowered, profile):
+    corpus = breach_corpus.get_breach_corpus()
+    return corpus is not None and corpus.count(password) > 0
+
+def load_policy(path):
+    """Read and compile a TOML or JSON policy file"""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML policies need Python 3.11+; use a JSON policy instead")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    settings = data.get("policy", data)
+    return CompiledPolicy(settings, name=os.path.splitext(os.path.basename(path))[0])
+
+def get_policy():
+    """Return the policy at PASSWORD_POLICY_PATH, compiled once per process, or None
+
+    A policy that fails to load is reported by get_policy_error() instead of
+    raising, and is not retried.
+    """
+    global _policy, _policy_error
+    policy = _policy
+    if policy is not _NOT_LOADED:
+        return policy
+
+    with _lock:
+        if _policy is _NOT_LOADED:
+            try:
+                _policy = load_policy(POLICY_PATH) if POLICY_PATH else None
+            except Exception as e:
+                _policy = None
+                _policy_error = e
+        return _policy
+
+def get_policy_error():
+    """Return the exception from loading the PASSWORD_POLICY_PATH policy, or None"""
+    return _policy_error
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python policy_engine.py <policy.toml|policy.json> <passwords.txt>")
+        sys.exit(1)
+    policy = load_policy(sys.argv[1])
+    with open(sys.argv[2], "r", encoding="utf-8", errors="ignore") as f:
+        passwords = [line.rstrip("\r\n") for line in f]
+    results = policy.check_many(passwords)
+    failed = sum(1 for result in results if not result.passed)
+    print(f"✅ {len(results) - failed:,} passed, ❌ {failed:,} failed policy '{policy.name}'")
@@ -315,7 +315,17 @@ def setup_environment():
     else:
         progress = update_checklist_item(progress, 'dependencies', False, "❌ requirements.txt not found")
     
-    # Step 4: Ready to run
+    # Step 4: Compile the common password index (app falls back to list.txt without it)
+    print(f"\n{YELLOW}⏳ Compiling common password index...{RESET}")
+    try:
+        subprocess.run([str(python_exe), 'wordlist_index.py'], capture_output=True, check=True)
+        subprocess.run([str(python_exe), 'substring_matcher.py'], capture_output=True, check=True)
+        subprocess.run([str(python_exe), 'markov_model.py'], capture_output=True, check=True)
+        safe_print("[OK] Common password index compiled")
+    except (subprocess.CalledProcessError, OSError):
+        safe_print("[  ] Could not compile index - list.txt will be parsed at startup")
+    
+    # Step 5: Ready to run
     progress = update_checklist_item(progress, 'ready', True, "Environment setup complete! 🎉")
     
     # Show final status
@@ -0,0 +1,263 @@
+"""
+Password Strength Checker - Embedded Common Password Matcher
+An Aho-Corasick automaton over list.txt that finds every common password
+hidden inside a longer one ("Summer2024!monkey") in a single pass.
+
+The trie is numbered in breadth-first order, so the children of a node are
+consecutive node ids and the whole automaton fits in a few flat arrays that
+are memory-mapped from a compiled file:
+    first    uint32 per node + 1, id of the node's first child
+    label    uint8 per node, byte on the edge from the parent
+    fail     uint32 per node, longest proper suffix that is also in the trie
+    out      uint32 per node, nearest node on the fail chain that ends a pattern
+    length   uint8 per node, length of the pattern ending here (0 if none)
+
+Build it with:
+    python substring_matcher.py [min_length]
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+import artifact_file
+import wordlist
+
+# Default location of the compiled automaton, next to list.txt
+MATCHER_PATH = os.path.splitext(wordlist.WORDLIST_PATH)[0] + ".ac"
+
+# Shorter entries match almost any string by chance, so they are not patterns
+DEFAULT_MIN_LENGTH = 5
+
+MAGIC = b"PSCAHOCO"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIQQ")
+
+def _trie_levels(entries):
+    """Yield the sorted, distinct prefixes of each length, shortest first"""
+    depth = 1
+    while entries:
+        level = []
+        for entry in entries:
+            prefix = entry[:depth]
+            if not level or level[-1] != prefix:
+                level.append(prefix)
+        yield level
+        entries = [entry for entry in entries if len(entry) > depth]
+        depth += 1
+
+def compile_automaton(entries, patterns, min_length=DEFAULT_MIN_LENGTH):
+    """Build an in-memory automaton over sorted UTF-8 entries, matching those in patterns"""
+    # Breadth-first numbering: node 0 is the root, then every level in sorted order
+    first = array("I")
+    label = bytearray(1)
+    length = bytearray(1)
+    parent_level = [b""]
+    next_id = 1
+    for level in _trie_levels(entries):
+        # Each parent's children are the consecutive prefixes that extend it
+        child = 0
+        for parent in parent_level:
+            first.append(next_id + child)
+            while child < len(level) and level[child][:-1] == parent:
+                child += 1
+        for prefix in level:
+            label.append(prefix[-1])
+            length.append(len(prefix) if prefix in patterns and len(prefix) < 256 else 0)
+        next_id += len(level)
+        parent_level = level
+    node_count = next_id
+    # Leaves on the deepest level have no children; the extra entry closes the last range
+    while len(first) < node_count + 1:
+        first.append(node_count)
+
+    matcher = AhoCorasick(first, label, array("I", bytes(4 * node_count)),
+                          array("I", bytes(4 * node_count)), length, min_length)
+    matcher._link_failures()
+    return matcher
+
+def build_matcher(source=wordlist.WORDLIST_PATH, dest=MATCHER_PATH, min_length=DEFAULT_MIN_LENGTH):
+    """Compile a wordlist text file into an Aho-Corasick automaton file, returning the node count"""
+    patterns = set()
+    entries = []
+    for pwd in wordlist.load_common_passwords(source):
+        encoded = pwd.encode("utf-8", "surrogatepass")
+        entries.append(encoded)
+        if len(encoded) >= min_length:
+            patterns.add(encoded)
+    entries.sort()
+    matcher = compile_automaton(entries, patterns, min_length)
+    node_count = len(matcher)
+
+    source_size, source_mtime = wordlist.source_stamp(source)
+    header = HEADER.pack(MAGIC, VERSION, node_count, min_length, source_size, source_mtime)
+    artifact_file.write_file(dest, header,
+                             artifact_file.to_little_endian(matcher.first),
+                             artifact_file.to_little_endian(matcher.fail),
+                             artifact_file.to_little_endian(matcher.out),
+                             bytes(matcher.label), bytes(matcher.length))
+    return node_count
+
+class AhoCorasick:
+    """Multi-pattern matcher over UTF-8 bytes backed by flat arrays"""
+
+    def __init__(self, first, label, fail, out, length, min_length=DEFAULT_MIN_LENGTH):
+        self.first = first
+        self.label = label
+        self.fail = fail
+        self.out = out
+        self.length = length
+        self.min_length = min_length
+        self._edge_keys = None
+
+    def __len__(self):
+        return len(self.label)
+
+    def _child(self, node, byte):
+        """Return the child of node along byte, or 0 if there is none"""
+        lo, hi = self.first[node], self.first[node + 1]
+        if lo == hi:
+            return 0
+        pos = self.label.find(byte, lo, hi)
+        return pos if pos >= 0 else 0
+
+    def _link_failures(self):
+        """Fill the fail and output links, visiting nodes in breadth-first order"""
+        first, label, fail, out, length = self.first, self.label, self.fail, self.out, self.length
+        # Children of the root keep the zero-initialised links back to the root
+        for node in range(1, len(label)):
+            for child in range(first[node], first[node + 1]):
+                byte = label[child]
+                f = fail[node]
+                target = self._child(f, byte)
+                while not target and f:
+                    f = fail[f]
+                    target = self._child(f, byte)
+                fail[child] = target
+                out[child] = target if length[target] else out[target]
+
+    def iter_matches(self, text):
+        """Yield (start, end) byte spans of every pattern occurring in the UTF-8 text"""
+        first, label, fail, out, length = self.first, self.label, self.fail, self.out, self.length
+        node = 0
+        for pos, byte in enumerate(text):
+            while True:
+                lo, hi = first[node], first[node + 1]
+                child = label.find(byte, lo, hi) if lo != hi else -1
+                if child >= 0:
+                    node = child
+                    break
+                if not node:
+                    break
+                node = fail[node]
+
+            hit = node if length[node] else out[node]
+            while hit:
+                yield pos + 1 - length[hit], pos + 1
+                hit = out[hit]
+
+    def advance(self, node, data):
+        """Feed UTF-8 bytes from automaton state node, returning (new node, whether a pattern ended)"""
+        first, label, fail, out, length = self.first, self.label, self.fail, self.out, self.length
+        hit = False
+        for byte in data:
+            while True:
+                lo, hi = first[node], first[node + 1]
+                child = label.find(byte, lo, hi) if lo != hi else -1
+                if child >= 0:
+                    node = child
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            if length[node] or out[node]:
+                hit = True
+        return node, hit
+
+    def hits_packed(self, codes, lengths):
+        """Vectorized bool(find_all()) for an (n, width) array of lower-cased ASCII codes and per-row lengths
+
+        Every row steps through the automaton together, one column at a time;
+        an edge is found by binary search over (parent, byte) keys, which
+        breadth-first numbering keeps sorted.
+        """
+        edge_keys = self._edge_keys
+        if edge_keys is None:
+            first = np.frombuffer(self.first, dtype=np.uint32).astype(np.int64)
+            parents = np.repeat(np.arange(len(self.label), dtype=np.int64), np.diff(first))
+            edge_keys = self._edge_keys = parents * 256 + np.frombuffer(self.label, dtype=np.uint8)[1:]
+        fail = np.frombuffer(self.fail, dtype=np.uint32)
+        ends = (np.frombuffer(self.length, dtype=np.uint8) != 0) | (np.frombuffer(self.out, dtype=np.uint32) != 0)
+
+        nodes = np.zeros(len(lengths), dtype=np.int64)
+        hits = np.zeros(len(lengths), dtype=bool)
+        for column in range(codes.shape[1]):
+            rows = np.flatnonzero(lengths > column)
+            if not len(rows):
+                break
+            state = nodes[rows]
+            byte = codes[rows, column].astype(np.int64)
+            pending = np.arange(len(rows))
+            while len(pending):
+                keys = state[pending] * 256 + byte[pending]
+                pos = np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)
+                found = edge_keys[pos] == keys
+                state[pending[found]] = pos[found] + 1
+                # Follow fail links from the nodes without that edge; the root gives up
+                pending = pending[~found]
+                pending = pending[state[pending] != 0]
+                state[pending] = fail[state[pending]]
+            nodes[rows] = state
+            hits[rows] |= ends[state]
+        return hits
+
+    def find_all(self, password):
+        """Return every common password embedded in a (lower-cased) password, longest first"""
+        encoded = password.encode("utf-8", "surrogatepass")
+        found = {encoded[start:end] for start, end in self.iter_matches(encoded)}
+        return sorted((m.decode("utf-8", "ignore") for m in found), key=len, reverse=True)
+
+    def find_spans(self, password):
+        """Return the (start, end) character spans of every common password in a (lower-cased) password"""
+        encoded = password.encode("utf-8", "surrogatepass")
+        if len(encoded) == len(password):
+            return list(self.iter_matches(encoded))
+        # Map byte offsets back to character offsets for non-ASCII passwords
+        char_at = {}
+        offset = 0
+        for i, ch in enumerate(password):
+            char_at[offset] = i
+            offset += len(ch.encode("utf-8", "surrogatepass"))
+        char_at[offset] = len(password)
+        return [(char_at[start], char_at[end]) for start, end in self.iter_matches(encoded)
+                if start in char_at and end in char_at]
+
+def open_current_matcher(path=MATCHER_PATH, source=wordlist.WORDLIST_PATH):
+    """Memory-map the compiled automaton if it exists and matches list.txt, otherwise return None"""
+    opened = artifact_file.open_current(path, HEADER, MAGIC, VERSION, source, stamp_at=4,
+                                        body_size=lambda fields: 4 * (fields[2] + 1) + 10 * fields[2],
+                                        native_layout=True)
+    if opened is None:
+        return None
+    mm, (_, _, node_count, min_length, _, _) = opened
+
+    view = memoryview(mm)
+    pos = HEADER.size
+    first = view[pos:pos + 4 * (node_count + 1)].cast("I")
+    pos += 4 * (node_count + 1)
+    fail = view[pos:pos + 4 * node_count].cast("I")
+    pos += 4 * node_count
+    out = view[pos:pos + 4 * node_count].cast("I")
+    pos += 4 * node_count
+    # Labels are copied out (one byte per node) so find() can scan child ranges
+    label = bytearray(view[pos:pos + node_count])
+    length = view[pos + node_count:pos + 2 * node_count]
+    return AhoCorasick(first, label, fail, out, length, min_length)
+
+if __name__ == "__main__":
+    min_length = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MIN_LENGTH
+    nodes = build_matcher(min_length=min_length)
+    print(f"✅ Built substring matcher with {nodes} nodes (minimum pattern length {min_length})")
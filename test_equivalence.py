@@ -0,0 +1,137 @@
+"""
+Password Strength Checker - Equivalence Tests
+The fast paths must give the same answers as the plain ones they replace:
+batch analysis, incremental analysis and the pass/fail verdict against full
+single-password analysis, and every prefilter against the scan it skips.
+
+Run them with:
+    python -m pytest
+"""
+
+import random
+import string
+
+import pytest
+
+import analyzer
+import batch_analysis
+import byte_steps
+import date_patterns
+import keyboard_graphs
+import wordlist
+from incremental_analysis import IncrementalAnalyzer
+
+# Hand-picked edge cases: empty, sequences, walks, dates, look-alikes,
+# embedded words, other scripts, context-dependent lower-casing, long input
+EDGE_CASES = [
+    "", "a", "abc", "cba", "abd", "xyz789", "9876", "qwerty", "zaq1xsw2", "!@#$%", "asdfgh",
+    "1987", "alice1987", "04121987", "12/04/87", "P@ssw0rd", "m0nk3y!", "Summer2024!monkey",
+    "drowssap", "aaaa", "abcabcabc", "Пароль123", "пароль", "中文密码abc", "😀😀😀", "éèê",
+    "ΑΣ", "İstanbul", "ǅungla", "KelvinK", "ábc", "x" * 80 + "é", "Tr0ub4dor&3",
+    "correct horse battery staple", "0123456789", "ZYXWVU",
+]
+
+def make_corpus(count=1500, seed=2024):
+    """A reproducible mix of common passwords, variations of them and random strings"""
+    rng = random.Random(seed)
+    common = sorted(wordlist.get_common_passwords())
+    alphabet = string.ascii_letters + string.digits + string.punctuation + "éДд中😀ΣßÅ٣² "
+    corpus = list(EDGE_CASES)
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            corpus.append(rng.choice(common))
+        elif kind == 1:
+            corpus.append(rng.choice(common).capitalize() + str(rng.randint(0, 2030)) + rng.choice("!@#$"))
+        elif kind == 2:
+            corpus.append(rng.choice(common).replace("a", "@").replace("o", "0").replace("e", "3"))
+        else:
+            corpus.append("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 24))))
+    return corpus
+
+@pytest.fixture(scope="module")
+def corpus():
+    wordlist.load_dictionary()
+    return make_corpus()
+
+def test_batch_matches_single(corpus):
+    columns = batch_analysis.analyze_many(corpus)
+    for i, password in enumerate(corpus):
+        result = analyzer.analyze_password_strength(password)
+        assert (columns["score"][i], columns["strength"][i], columns["color"][i],
+                columns["issue_mask"][i]) == (result.score, result.label, result.color, result.issue_mask), password
+        assert columns["issues"][i] == result.issues, password
+        assert columns["entropy"][i] == analyzer.calculate_entropy(password), password
+
+def test_batch_matches_single_with_custom_rules(corpus):
+    # A cheap rule that adds a pattern bit and a late one that reads the mask so far
+    analyzer.register_rule("test_cheap", lambda context, mask: (5, analyzer.REPEATING if "a" in context.password else 0))
+    analyzer.register_rule("test_late", lambda context, mask: (-3 if mask & analyzer.COMMON_PASSWORD else 2, 0),
+                           cost=20, max_points=2)
+    try:
+        columns = batch_analysis.analyze_many(corpus)
+        for i, password in enumerate(corpus):
+            result = analyzer.analyze_password_strength(password)
+            assert (columns["score"][i], columns["issue_mask"][i]) == (result.score, result.issue_mask), password
+    finally:
+        analyzer.RULES.unregister("test_cheap")
+        analyzer.RULES.unregister("test_late")
+
+def test_incremental_matches_full(corpus):
+    incremental = IncrementalAnalyzer()
+    for password in corpus:
+        # Typing, deleting back to a prefix and editing the middle
+        for text in (password[:len(password) // 2], password, password[:-1], "x" + password[1:]):
+            assert incremental.analyze(text) == analyzer.analyze_password_strength(text), text
+
+@pytest.mark.parametrize("min_score", [20, 40, 60, 80])
+def test_verdict_matches_full(corpus, min_score):
+    for password in corpus:
+        expected = analyzer.analyze_password_strength(password).score >= min_score
+        assert analyzer.is_acceptable(password, min_score) == expected, password
+
+def test_byte_steps_match_naive():
+    rng = random.Random(7)
+    for n in (0, 1, 2, 5, 64, 1100):
+        data = bytes(rng.randrange(128) for _ in range(n))
+        naive = bytes((0x80 + b - (data[i - 1] if i else 0)) % 256 for i, b in enumerate(data))
+        assert byte_steps.byte_steps(data) == naive
+
+def test_has_sequence_matches_scan(corpus):
+    for password in corpus:
+        lowered = password.lower()
+        codes = [analyzer.SEQUENCE_CODES.get(ch) for ch in lowered]
+        naive = any(length >= analyzer.MIN_SEQUENCE_LENGTH for _, length, _ in analyzer.sequence_runs(codes))
+        assert analyzer.has_sequence(lowered) == naive, password
+
+def test_keyboard_prefilter_matches_walking_every_layout(corpus):
+    for password in corpus:
+        lowered = password.lower()
+        for min_length in (3, analyzer.MIN_KEYBOARD_WALK):
+            naive = [(name,) + walk for name, layout in keyboard_graphs.LAYOUTS.items()
+                     for walk in layout.walks(lowered, min_length)]
+            assert keyboard_graphs.find_walks(lowered, min_length) == naive, password
+
+def test_embedded_matcher_rows_match_find_all(corpus):
+    matcher = wordlist.get_substring_matcher()
+    if matcher is None:
+        pytest.skip("no compiled substring matcher (python substring_matcher.py)")
+    lowered = [password.lower() for password in corpus if password.isascii()]
+    codes, lengths = batch_analysis.pack_passwords(lowered)
+    hits = matcher.hits_packed(codes, lengths)
+    assert hits.tolist() == [bool(matcher.find_all(password)) for password in lowered]
+
+def test_batch_prefilters_match_scalar_checks(corpus):
+    passwords = [password for password in corpus if password.isascii()]
+    codes, lengths = batch_analysis.pack_passwords([password.lower() for password in passwords])
+    sequences = batch_analysis._sequence_rows(codes)
+    keyboard = batch_analysis._keyboard_rows(codes, lengths)
+    dates = batch_analysis._date_rows(codes)
+    for i, password in enumerate(passwords):
+        lowered = password.lower()
+        assert sequences[i] == analyzer.has_sequence(lowered), password
+        # Keyboard and date rows only have to include every row with a match
+        if analyzer.find_keyboard_patterns(lowered):
+            assert keyboard[i], password
+        if date_patterns.has_date(password):
+            assert dates[i], password
@@ -13,6 +13,7 @@ from pathlib import Path
 # Required packages
 REQUIRED_PACKAGES = [
     ('streamlit', '1.28.0'),
+    ('numpy', None),
     ('re', None),  # Built-in
     ('math', None),  # Built-in
     ('collections', None),  # Built-in
@@ -71,6 +72,26 @@ def check_files():
     """Check if required files exist"""
     required_files = [
         'app.py',
+        'analyzer.py',
+        'batch_analysis.py',
+        'wordlist.py',
+        'wordlist_index.py',
+        'artifact_file.py',
+        'bloom_filter.py',
+        'substring_matcher.py',
+        'leet_index.py',
+        'keyboard_graphs.py',
+        'byte_steps.py',
+        'pattern_matching.py',
+        'date_patterns.py',
+        'guess_estimation.py',
+        'crack_time.py',
+        'rule_pipeline.py',
+        'policy_engine.py',
+        'incremental_analysis.py',
+        'analysis_cache.py',
+        'markov_model.py',
+        'pcfg_model.py',
         'requirements.txt',
         'README.md',
         'run.py'
@@ -0,0 +1,386 @@
+"""
+Password Strength Checker - Common Password Wordlist
+Loads list.txt once per server process and shares it between all sessions.
+When a compiled index (see wordlist_index.py) is present and up to date it is
+memory-mapped instead of parsing the text file, optionally behind a Bloom
+filter (see bloom_filter.py). The Aho-Corasick matcher for common passwords
+embedded in longer ones (see substring_matcher.py), the leetspeak index
+(see leet_index.py), the character Markov model (see markov_model.py) and the
+PCFG structure model (see pcfg_model.py) are shared the same way.
+
+start_background_load warms all of these in a daemon thread so the first page
+renders immediately; while that thread runs, get_available_passwords serves
+the most popular entries from the top of list.txt and the get_available_*
+lookups of the other structures return None. Without a background load they
+load everything on first use, like the get_* loaders.
+
+A background watcher (start_watcher) notices when list.txt changes, rebuilds
+everything off the request path and swaps the new structures in at once.
+Analyses already holding the old objects finish on them.
+"""
+
+import os
+import threading
+from array import array
+from bisect import bisect_left
+
+# Default location of the common password list shipped with the app
+WORDLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "list.txt")
+
+# Seconds between checks for a changed list.txt (0 disables hot reload)
+WATCH_INTERVAL = float(os.environ.get("WORDLIST_WATCH_INTERVAL", "30"))
+
+# Most popular entries served while the full list is still loading
+PARTIAL_SIZE = 10000
+
+# Process-wide cache. Streamlit re-executes app.py on every rerun, but imported
+# modules stay in sys.modules, so this state is shared by every session.
+_lock = threading.Lock()
+_common_passwords = None
+_load_error = None
+_NOT_LOADED = object()
+_substring_matcher = _NOT_LOADED
+_leet_index = None
+_markov_model = _NOT_LOADED
+_pcfg_model = None
+_watcher = None
+_loader = None
+_partial_lock = threading.Lock()
+_partial_passwords = None
+
+def source_stamp(path=WORDLIST_PATH):
+    """Return the (size, mtime_ns) pair used to detect artifacts built from an older list"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def read_password_ranks(path=WORDLIST_PATH, limit=None):
+    """Map each lower-cased password in a wordlist to its 1-based popularity rank
+
+    list.txt is ordered from most to least used, so the rank is the line
+    position; case variants keep the rank of their first occurrence. With a
+    limit, only the first limit entries are read.
+    """
+    ranks = {}
+    rank = 0
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            pwd = line.strip().lower()
+            if pwd:
+                rank += 1
+                ranks.setdefault(pwd, rank)
+                if limit is not None and rank >= limit:
+                    break
+    return ranks
+
+class RankedWordlist:
+    """In-memory wordlist with ranks kept in a compact array beside the sorted entries"""
+
+    def __init__(self, ranks):
+        self._entries = sorted(ranks)
+        self._members = frozenset(self._entries)
+        self._ranks = array("I", (ranks[pwd] for pwd in self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __contains__(self, password):
+        return password in self._members
+
+    def items(self):
+        """Yield (password, rank) pairs in sorted order"""
+        return zip(self._entries, self._ranks)
+
+    def rank(self, password):
+        """Return the popularity rank of a common password, or None if it is not in the list"""
+        if password not in self._members:
+            return None
+        return self._ranks[bisect_left(self._entries, password)]
+
+def load_common_passwords(path=WORDLIST_PATH):
+    """Read a wordlist file into a RankedWordlist of lower-cased passwords"""
+    return RankedWordlist(read_password_ranks(path))
+
+def _load():
+    """Open the compiled index if usable, otherwise parse list.txt"""
+    import bloom_filter
+    import wordlist_index
+    index = wordlist_index.open_current_index()
+    if index is None:
+        return load_common_passwords()
+
+    # An optional Bloom filter answers most misses without touching the index
+    bloom = bloom_filter.open_current_filter()
+    if bloom is not None:
+        return bloom_filter.FilteredWordlist(bloom, index)
+    return index
+
+def get_common_passwords():
+    """Return the shared common password collection, loading it on first use
+
+    The result supports ``in``, ``len()`` and ``rank()`` whether it is an
+    in-memory RankedWordlist, a memory-mapped WordlistIndex or a
+    Bloom-filtered index.
+    """
+    global _common_passwords, _load_error
+    common = _common_passwords
+    if common is not None:
+        return common
+
+    with _lock:
+        # Another thread may have finished loading while we waited
+        if _common_passwords is None:
+            try:
+                _common_passwords = _load()
+                _load_error = None
+            except Exception as e:
+                _common_passwords = RankedWordlist({})
+                _load_error = e
+        return _common_passwords
+
+def is_loading():
+    """Check whether start_background_load's thread is still loading"""
+    loader = _loader
+    return loader is not None and loader.is_alive()
+
+def get_available_passwords():
+    """Return the full wordlist, or only its most popular entries while a background load runs
+
+    Never waits for a background load, so the UI can analyze passwords while
+    start_background_load is still running; otherwise the full list is loaded.
+    """
+    global _partial_passwords
+    common = _common_passwords
+    if common is not None:
+        return common
+    if not is_loading():
+        return get_common_passwords()
+
+    with _partial_lock:
+        if _partial_passwords is None:
+            try:
+                _partial_passwords = RankedWordlist(read_password_ranks(limit=PARTIAL_SIZE))
+            except OSError:
+                _partial_passwords = RankedWordlist({})
+        return _partial_passwords
+
+def get_available_substring_matcher():
+    """Return the embedded-password matcher, or None while a background load runs"""
+    matcher = _substring_matcher
+    if matcher is not _NOT_LOADED:
+        return matcher
+    return None if is_loading() else get_substring_matcher()
+
+def get_available_leet_index():
+    """Return the leetspeak index, or None while a background load runs"""
+    index = _leet_index
+    if index is not None:
+        return index
+    return None if is_loading() else get_leet_index()
+
+def is_list_loaded():
+    """Check whether the full wordlist is loaded, so exact lookups no longer use the partial list"""
+    return _common_passwords is not None
+
+def is_ready():
+    """Check whether the full wordlist and the look-alike and embedded-password structures are loaded"""
+    return (_common_passwords is not None and _leet_index is not None
+            and _substring_matcher is not _NOT_LOADED)
+
+def get_substring_matcher():
+    """Return the shared embedded-password matcher, or None if it has not been built"""
+    global _substring_matcher
+    matcher = _substring_matcher
+    if matcher is not _NOT_LOADED:
+        return matcher
+
+    import substring_matcher
+    with _lock:
+        if _substring_matcher is _NOT_LOADED:
+            _substring_matcher = substring_matcher.open_current_matcher()
+        return _substring_matcher
+
+def peek_markov_model():
+    """Return the character Markov model if it has been loaded, without loading it"""
+    model = _markov_model
+    return None if model is _NOT_LOADED else model
+
+def get_markov_model():
+    """Return the shared character Markov model, or None if it has not been built"""
+    global _markov_model
+    model = _markov_model
+    if model is not _NOT_LOADED:
+        return model
+
+    import markov_model
+    with _lock:
+        if _markov_model is _NOT_LOADED:
+            _markov_model = markov_model.open_current_model()
+        return _markov_model
+
+def get_leet_index():
+    """Return the shared leetspeak index, building it from the wordlist on first use"""
+    global _leet_index
+    index = _leet_index
+    if index is not None:
+        return index
+
+    import leet_index
+    common = get_common_passwords()
+    with _lock:
+        if _leet_index is None:
+            _leet_index = leet_index.LeetIndex(common.items())
+        return _leet_index
+
+def peek_pcfg_model():
+    """Return the PCFG structure model if it has been trained, without training it"""
+    return _pcfg_model
+
+def get_pcfg_model():
+    """Return the shared PCFG structure model, training it on the wordlist on first use"""
+    global _pcfg_model
+    model = _pcfg_model
+    if model is not None:
+        return model
+
+    import pcfg_model
+    common = get_common_passwords()
+    with _lock:
+        if _pcfg_model is None:
+            _pcfg_model = pcfg_model.PCFGModel(common)
+        return _pcfg_model
+
+def get_load_error():
+    """Return the exception from the last failed load, or None (also while a load is still running)"""
+    return _load_error
+
+def invalidate():
+    """Drop the cached wordlist so the next lookup reloads list.txt"""
+    global _common_passwords, _load_error, _substring_matcher, _leet_index, _markov_model, _pcfg_model
+    with _lock:
+        _common_passwords = None
+        _substring_matcher = _NOT_LOADED
+        _leet_index = None
+        _markov_model = _NOT_LOADED
+        _pcfg_model = None
+        _load_error = None
+
+def load_dictionary():
+    """Load the full wordlist and the structures scoring looks passwords up in, waiting until they are ready"""
+    get_common_passwords()
+    get_substring_matcher()
+    get_leet_index()
+
+def load_all():
+    """Load the full wordlist and every structure built from it, waiting until they are ready"""
+    load_dictionary()
+    get_markov_model()
+    get_pcfg_model()
+
+def start_background_load():
+    """Load the wordlist and its indexes in a daemon thread once per process; later calls are no-ops"""
+    global _loader
+    with _partial_lock:
+        if _loader is None:
+            _loader = threading.Thread(target=load_all, name="wordlist-loader", daemon=True)
+            _loader.start()
+        return _loader
+
+def _rebuild_artifacts():
+    """Recompile the on-disk artifacts that were already in use for the new list.txt"""
+    import bloom_filter
+    import markov_model
+    import substring_matcher
+    import wordlist_index
+    builders = [
+        (wordlist_index.INDEX_PATH, wordlist_index.build_index),
+        (bloom_filter.FILTER_PATH, bloom_filter.build_filter),
+        (substring_matcher.MATCHER_PATH, substring_matcher.build_matcher),
+        (markov_model.MODEL_PATH, markov_model.build_model),
+    ]
+    for path, build in builders:
+        if os.path.exists(path):
+            try:
+                build()
+            except OSError:
+                # Read-only deployments fall back to parsing list.txt in memory
+                pass
+
+def reload():
+    """Rebuild every wordlist structure and swap them in together
+
+    The new structures are built without holding the lock, so lookups keep
+    using the old ones until the swap.
+    """
+    global _common_passwords, _load_error, _substring_matcher, _leet_index, _markov_model, _pcfg_model
+    import leet_index
+    import markov_model
+    import pcfg_model
+    import substring_matcher
+    _rebuild_artifacts()
+    common = _load()
+    matcher = substring_matcher.open_current_matcher()
+    leet = leet_index.LeetIndex(common.items())
+    model = markov_model.open_current_model()
+    pcfg = pcfg_model.PCFGModel(common)
+    with _lock:
+        _common_passwords = common
+        _substring_matcher = matcher
+        _leet_index = leet
+        _markov_model = model
+        _pcfg_model = pcfg
+        _load_error = None
+
+class WordlistWatcher(threading.Thread):
+    """Daemon thread that polls list.txt and reloads it after it changes"""
+
+    def __init__(self, path=WORDLIST_PATH, interval=WATCH_INTERVAL):
+        super().__init__(name="wordlist-watcher", daemon=True)
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        # Taken before the thread starts so an edit made right away is not missed
+        self._loaded = self._stamp()
+
+    def _stamp(self):
+        try:
+            return source_stamp(self.path)
+        except OSError:
+            return None
+
+    def run(self):
+        loaded = self._loaded
+        pending = None
+        while not self._stop_event.wait(self.interval):
+            current = self._stamp()
+            if current is None or current == loaded:
+                pending = None
+                continue
+            # Wait until the file has stopped changing for one interval so a
+            # list that is still being written is never loaded
+            if current != pending:
+                pending = current
+                continue
+            try:
+                reload()
+            except Exception:
+                # Keep serving the old list; only the next change to list.txt retries
+                pass
+            loaded = current
+            pending = None
+
+    def stop(self):
+        self._stop_event.set()
+
+def start_watcher(interval=WATCH_INTERVAL):
+    """Start the process-wide list.txt watcher once; later calls are no-ops"""
+    global _watcher
+    if interval <= 0:
+        return None
+    with _lock:
+        if _watcher is None:
+            _watcher = WordlistWatcher(interval=interval)
+            _watcher.start()
+        return _watcher
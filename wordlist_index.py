@@ -0,0 +1,147 @@
+"""
+Password Strength Checker - Binary Wordlist Index
+Compiles list.txt into a sorted binary index that is searched through mmap,
+so a server process pays almost nothing to load it and the pages are shared
+between processes by the OS page cache.
+
+Build it with:
+    python wordlist_index.py [list.txt] [list.idx]
+
+File layout (all integers little-endian):
+    header   magic, version, entry count, blob size, source size,
+             source mtime (ns), SHA-256 of everything after the header
+    offsets  (count + 1) uint32 start offsets into the string blob
+    ranks    count uint32 popularity ranks (line position in list.txt)
+    blob     lower-cased UTF-8 entries, sorted by bytes and deduplicated
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from array import array
+
+import artifact_file
+import wordlist
+
+# Default location of the compiled index, next to list.txt
+INDEX_PATH = os.path.splitext(wordlist.WORDLIST_PATH)[0] + ".idx"
+
+MAGIC = b"PSCWLIDX"
+VERSION = 2
+HEADER = struct.Struct("<8sIIIQQ32s")
+OFFSET_PAIR = struct.Struct("<II")
+RANK = struct.Struct("<I")
+
+def build_index(source=wordlist.WORDLIST_PATH, dest=INDEX_PATH):
+    """Compile a wordlist text file into a binary index, returning the entry count"""
+    ranks = wordlist.read_password_ranks(source)
+    ranked = sorted((pwd.encode("utf-8", "surrogatepass"), rank) for pwd, rank in ranks.items())
+    entries = [entry for entry, _ in ranked]
+
+    offsets = array("I", [0])
+    for entry in entries:
+        offsets.append(offsets[-1] + len(entry))
+    rank_table = array("I", (rank for _, rank in ranked))
+
+    blob = b"".join(entries)
+    body = artifact_file.to_little_endian(offsets) + artifact_file.to_little_endian(rank_table) + blob
+    source_size, source_mtime = wordlist.source_stamp(source)
+    header = HEADER.pack(MAGIC, VERSION, len(entries), len(blob),
+                         source_size, source_mtime, hashlib.sha256(body).digest())
+
+    artifact_file.write_file(dest, header, body)
+    return len(entries)
+
+class WordlistIndex:
+    """Read-only, memory-mapped view of a compiled wordlist index"""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self._mm, fields = artifact_file.map_file(path, HEADER, MAGIC, VERSION)
+        _, _, self._count, blob_size, self.source_size, self.source_mtime, self.digest = fields
+
+        self._offsets_start = HEADER.size
+        self._ranks_start = self._offsets_start + 4 * (self._count + 1)
+        self._blob_start = self._ranks_start + 4 * self._count
+        if len(self._mm) != self._blob_start + blob_size:
+            self._mm.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, password):
+        return self.find(password) >= 0
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self.entry(i)
+
+    def items(self):
+        """Yield (password, rank) pairs in sorted order"""
+        for i in range(self._count):
+            yield self.entry(i), RANK.unpack_from(self._mm, self._ranks_start + 4 * i)[0]
+
+    def entry(self, i):
+        """Return the i-th entry in sorted order"""
+        start, end = OFFSET_PAIR.unpack_from(self._mm, self._offsets_start + 4 * i)
+        return self._mm[self._blob_start + start:self._blob_start + end].decode("utf-8", "surrogatepass")
+
+    def find(self, password):
+        """Binary search for an exact entry, returning its sorted position or -1"""
+        key = password.encode("utf-8", "surrogatepass")
+        mm = self._mm
+        offsets_start = self._offsets_start
+        blob_start = self._blob_start
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = OFFSET_PAIR.unpack_from(mm, offsets_start + 4 * mid)
+            candidate = mm[blob_start + start:blob_start + end]
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def rank(self, password):
+        """Return the popularity rank of a common password, or None if it is not in the list"""
+        pos = self.find(password)
+        if pos < 0:
+            return None
+        return RANK.unpack_from(self._mm, self._ranks_start + 4 * pos)[0]
+
+    def matches_source(self, source=wordlist.WORDLIST_PATH):
+        """Check whether the index was built from the current version of a wordlist"""
+        return artifact_file.matches_source(self.source_size, self.source_mtime, source)
+
+    def verify(self):
+        """Recompute the body checksum and compare it with the header"""
+        return hashlib.sha256(self._mm[HEADER.size:]).digest() == self.digest
+
+    def close(self):
+        self._mm.close()
+
+def open_current_index(path=INDEX_PATH, source=wordlist.WORDLIST_PATH):
+    """Open the compiled index if it exists, is up to date and passes its checksum, otherwise return None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        index = WordlistIndex(path)
+    except (OSError, ValueError):
+        return None
+    # A damaged index could answer "not common" for a common password, so it is never used
+    if not index.matches_source(source) or not index.verify():
+        index.close()
+        return None
+    return index
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else wordlist.WORDLIST_PATH
+    dest = sys.argv[2] if len(sys.argv) > 2 else INDEX_PATH
+    count = build_index(source, dest)
+    print(f"✅ Indexed {count} common passwords into {dest}")